@@ -4,12 +4,12 @@ Main application file with authentication and dashboard functionality
 """
 
 import streamlit as st
-import streamlit_authenticator as stauth
 import pandas as pd
 from datetime import datetime, date, timedelta
 import time
-from typing import Optional
 import os
+import math
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -17,15 +17,21 @@ load_dotenv()
 
 # Import utility modules
 from utils.database import (
-    get_supabase_client,
     load_aispot_data,
+    get_aispot_store,
     update_approval_status,
     update_aispot_record,
-    get_aispot_by_id
+    get_aispot_by_id,
+    get_search_index,
+    get_statistics
 )
+from utils.auth import create_authenticator, uses_default_credentials
 from utils.pdf_generator import generate_standee_pdf
+from utils.template_renderer import render_standee_html
+from utils.bulk_export import export_standees
 from utils.email_sender import send_standee_email
-from utils.analytics_email import send_analytics_email, send_bulk_analytics_emails
+from utils.analytics_email import send_analytics_email
+from utils.job_queue import get_job_queue, enqueue_bulk_analytics, job_throughput
 
 # Page configuration
 st.set_page_config(
@@ -35,6 +41,27 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Rows per page options for the AI Spots table
+TABLE_PAGE_SIZES = [10, 25, 50, 100]
+
+# Bulk standee exports: spot cap per export (each locally drawn page is
+# ~0.4 MB at BULK_EXPORT_DPI) and how long unclaimed export files are kept
+# before being swept
+BULK_EXPORT_MAX_SPOTS = int(os.getenv("BULK_EXPORT_MAX_SPOTS", "300"))
+BULK_EXPORT_DIR = os.path.join(tempfile.gettempdir(), "aispot_exports")
+BULK_EXPORT_MAX_AGE_SECONDS = 3600
+
+# Seconds between progress refreshes while a background job is running
+JOB_PROGRESS_REFRESH_SECONDS = 3
+
+# Sort options: (column, ascending)
+SORT_OPTIONS = {
+    "Date (Newest)": ('created_at', False),
+    "Date (Oldest)": ('created_at', True),
+    "Name (A-Z)": ('name', True),
+    "Name (Z-A)": ('name', False)
+}
+
 # Custom CSS for styling
 st.markdown("""
 <style>
@@ -99,32 +126,14 @@ st.markdown("""
 # Authentication setup
 def setup_authentication():
     """Setup authentication with streamlit-authenticator"""
-    # Hash password for 'arijitwith'
-    hashed_passwords = stauth.Hasher(['arijitwith']).generate()
-    
-    credentials = {
-        'usernames': {
-            'admin': {
-                'name': 'Admin User',
-                'password': hashed_passwords[0]
-            }
-        }
-    }
-    
-    authenticator = stauth.Authenticate(
-        credentials,
-        'aispot_admin',
-        'aispot_admin_cookie_key_12345',
-        cookie_expiry_days=1
-    )
-    
-    return authenticator
+    # Passwords are pre-hashed and loaded once per process (see utils/auth.py)
+    return create_authenticator()
 
-def display_stats(df):
+def display_stats(stats):
     """Display statistics cards at the top"""
-    total_spots = len(df)
-    approved_spots = len(df[df['is_approved'] == True])
-    pending_spots = total_spots - approved_spots
+    total_spots = stats['total']
+    approved_spots = stats['approved']
+    pending_spots = stats['pending']
     
     col1, col2, col3 = st.columns(3)
     
@@ -152,35 +161,16 @@ def display_stats(df):
         </div>
         """, unsafe_allow_html=True)
 
-def apply_filters(df, search_query, type_filter, approval_filter, state_filter):
-    """Apply filters to dataframe"""
-    filtered_df = df.copy()
-    
-    # Search filter
-    if search_query:
-        mask = (
-            filtered_df['name'].str.contains(search_query, case=False, na=False) |
-            filtered_df['type_of_place'].str.contains(search_query, case=False, na=False) |
-            filtered_df['city'].str.contains(search_query, case=False, na=False) |
-            filtered_df['state'].str.contains(search_query, case=False, na=False)
-        )
-        filtered_df = filtered_df[mask]
-    
-    # Type filter
-    if type_filter != "All":
-        filtered_df = filtered_df[filtered_df['type_of_place'] == type_filter]
-    
-    # Approval filter
-    if approval_filter == "Approved":
-        filtered_df = filtered_df[filtered_df['is_approved'] == True]
-    elif approval_filter == "Pending":
-        filtered_df = filtered_df[filtered_df['is_approved'] == False]
-    
-    # State filter
-    if state_filter != "All":
-        filtered_df = filtered_df[filtered_df['state'] == state_filter]
-    
-    return filtered_df
+def apply_filters(df, search_query, type_filter, approval_filter, state_filter, sort_option="Date (Newest)"):
+    """Apply filters and sorting to dataframe"""
+    index = get_search_index(df)
+    
+    # Intersect the precomputed masks; the search box is matched literally
+    mask = index.mask(search_query, type_filter, approval_filter, state_filter)
+    
+    # Take the filtered rows through the precomputed sort permutation
+    column, ascending = SORT_OPTIONS[sort_option]
+    return df.iloc[index.select(mask, column, ascending)]
 
 def display_edit_form(row):
     """Display edit form for a row"""
@@ -253,17 +243,8 @@ def display_html_preview(row):
     """Display HTML preview of standee"""
     st.subheader(f"HTML Preview: {row['name']}")
     
-    # Load template
-    template_path = os.path.join(os.path.dirname(__file__), 'templates', 'tablestandee.html')
-    with open(template_path, 'r', encoding='utf-8') as f:
-        html_template = f.read()
-    
-    # Replace placeholders
-    html_content = html_template.replace('{{name}}', row['name'])
-    html_content = html_content.replace('{{type_of_place}}', row['type_of_place'])
-    html_content = html_content.replace('{{manager_name}}', row['owner_manager_name'])
-    html_content = html_content.replace('{{aispot_id}}', row['aispot_id'][:8])
-    html_content = html_content.replace('{{qr_code_link}}', row['qr_code_link'])
+    # Render from the cached, precompiled template
+    html_content = render_standee_html(row)
     
     # Display HTML in iframe
     st.components.v1.html(html_content, height=800, scrolling=True)
@@ -272,6 +253,176 @@ def display_html_preview(row):
         st.session_state.viewing_html = None
         st.rerun()
 
+def remove_bulk_export_file():
+    """Delete this session's export file (after download, on close or before a new export)"""
+    export_file = st.session_state.get('bulk_export_file')
+    st.session_state.bulk_export_file = None
+    if export_file and os.path.exists(export_file['path']):
+        os.remove(export_file['path'])
+
+def sweep_stale_exports():
+    """Delete export files left behind by sessions that ended without downloading"""
+    if not os.path.isdir(BULK_EXPORT_DIR):
+        return
+    cutoff = time.time() - BULK_EXPORT_MAX_AGE_SECONDS
+    for entry in os.scandir(BULK_EXPORT_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+def display_bulk_export(filtered_df):
+    """Export standees for every filtered AI Spot as a ZIP or one multi-page PDF"""
+    st.markdown(f"#### 📦 Export Standees for {len(filtered_df)} AI Spot(s)")
+    
+    too_many = len(filtered_df) > BULK_EXPORT_MAX_SPOTS
+    if too_many:
+        st.warning(f"⚠️ Exports are limited to {BULK_EXPORT_MAX_SPOTS} AI Spots. Narrow the filters to export.")
+    
+    export_format = st.radio(
+        "Format",
+        ["ZIP of PDFs (one per AI Spot)", "Single multi-page PDF (one A4 page per AI Spot)"],
+        key="bulk_export_format",
+        horizontal=True
+    )
+    is_zip = export_format.startswith("ZIP")
+    
+    col_export1, col_export2, col_export3 = st.columns(3)
+    
+    with col_export1:
+        start_export = st.button("🚀 Start Export", use_container_width=True, disabled=filtered_df.empty or too_many)
+    
+    with col_export3:
+        if st.button("Close Export", use_container_width=True):
+            remove_bulk_export_file()
+            st.session_state.bulk_export_picker = False
+            st.rerun()
+    
+    if start_export:
+        # Replace any previous export file
+        remove_bulk_export_file()
+        sweep_stale_exports()
+        os.makedirs(BULK_EXPORT_DIR, exist_ok=True)
+        
+        suffix = ".zip" if is_zip else ".pdf"
+        fd, export_path = tempfile.mkstemp(prefix="aispot_standees_", suffix=suffix, dir=BULK_EXPORT_DIR)
+        progress = st.progress(0.0, text="Rendering standees...")
+        
+        def on_progress(done, total, row):
+            progress.progress(done / total, text=f"Rendered {done} of {total}: {row.get('name', '')}")
+        
+        results = None
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                results = export_standees(
+                    filtered_df.to_dict('records'),
+                    f,
+                    output_format='zip' if is_zip else 'pdf',
+                    progress_callback=on_progress
+                )
+        finally:
+            if not results or results['exported'] == 0:
+                os.remove(export_path)
+        
+        if results['exported'] > 0:
+            st.session_state.bulk_export_file = {
+                'path': export_path,
+                'file_name': f"aispot_standees_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}",
+                'mime': "application/zip" if is_zip else "application/pdf"
+            }
+            st.success(f"✅ Exported {results['exported']} standee(s)")
+        if results['failed'] > 0:
+            st.error(f"❌ Failed to render {results['failed']} standee(s)")
+            st.warning(f"Failed spots: {', '.join(results['failed_spots'])}")
+    
+    # Served once: downloading deletes the file, so later reruns don't load it again
+    export_file = st.session_state.bulk_export_file
+    if export_file and os.path.exists(export_file['path']):
+        with col_export2:
+            with open(export_file['path'], 'rb') as f:
+                st.download_button(
+                    label="⬇️ Download Export",
+                    data=f,
+                    file_name=export_file['file_name'],
+                    mime=export_file['mime'],
+                    on_click=remove_bulk_export_file,
+                    use_container_width=True
+                )
+
+def display_jobs():
+    """Display recent background jobs with live progress and per-spot outcomes"""
+    jobs = get_job_queue().list_jobs(limit=5)
+    if not jobs:
+        return
+    
+    any_running = any(job['status'] in ('queued', 'running') for job in jobs)
+    
+    with st.expander("📬 Background Jobs", expanded=any_running):
+        for job in jobs:
+            params = job['params']
+            total = job['total'] or 1
+            throughput = job_throughput(job)
+            
+            st.markdown(
+                f"**Job #{job['id']}** - Analytics emails {params.get('start_date', '')[:10]} to "
+                f"{params.get('end_date', '')[:10]} - `{job['status']}`"
+            )
+            st.progress(
+                min(job['done'] / total, 1.0),
+                text=f"{job['done']} of {job['total']} | ✅ {job['success']} | ❌ {job['failed']}"
+                     + (f" | {throughput:.1f} spots/min" if throughput else "")
+            )
+            if job['error']:
+                st.error(f"❌ {job['error']}")
+            
+            if job['done'] and st.checkbox("Show per-spot outcomes", key=f"job_items_{job['id']}"):
+                items = pd.DataFrame(get_job_queue().job_items(job['id']))
+                items['success'] = items['success'].astype(bool)
+                st.dataframe(
+                    items[['name', 'success', 'seconds', 'error']],
+                    use_container_width=True,
+                    hide_index=True
+                )
+        
+        col_refresh, col_auto = st.columns(2)
+        with col_refresh:
+            st.button("🔄 Refresh Progress", key="refresh_jobs", use_container_width=True)
+        with col_auto:
+            auto_refresh = st.checkbox("Auto-refresh while running", key="jobs_auto_refresh", value=True)
+    
+    # Polled after the rest of the page has rendered (see the bottom of this file)
+    st.session_state.refresh_jobs = any_running and auto_refresh
+
+def display_pagination(filtered_df):
+    """Display page size and page navigation; return the rows on the current page"""
+    total_rows = len(filtered_df)
+    
+    col_size, col_prev, col_page, col_next = st.columns([2, 1, 2, 1])
+    
+    with col_size:
+        page_size = st.selectbox("Rows per page", TABLE_PAGE_SIZES, index=1, key="table_page_size")
+    
+    page_count = max(1, math.ceil(total_rows / page_size))
+    page = min(max(st.session_state.table_page, 1), page_count)
+    
+    with col_prev:
+        if st.button("◀ Previous", key="table_prev_page", disabled=page <= 1, use_container_width=True):
+            page -= 1
+    
+    with col_next:
+        if st.button("Next ▶", key="table_next_page", disabled=page >= page_count, use_container_width=True):
+            page += 1
+    
+    st.session_state.table_page = page
+    start = (page - 1) * page_size
+    end = min(start + page_size, total_rows)
+    
+    with col_page:
+        st.markdown(f"Page **{page}** of **{page_count}** (rows {start + 1}-{end} of {total_rows})")
+    
+    return filtered_df.iloc[start:end]
+
 def main():
     """Main application logic"""
     
@@ -286,6 +437,15 @@ def main():
         st.session_state.bulk_date_picker = False
     if 'custom_date_aispot' not in st.session_state:
         st.session_state.custom_date_aispot = None
+    if 'bulk_export_picker' not in st.session_state:
+        st.session_state.bulk_export_picker = False
+    if 'bulk_export_file' not in st.session_state:
+        st.session_state.bulk_export_file = None
+    if 'table_page' not in st.session_state:
+        st.session_state.table_page = 1
+    if 'table_filters' not in st.session_state:
+        st.session_state.table_filters = None
+    st.session_state.refresh_jobs = False
     
     # Setup authentication
     authenticator = setup_authentication()
@@ -299,7 +459,8 @@ def main():
     
     if authentication_status == None:
         st.warning('⚠️ Please enter your username and password')
-        st.info("**Demo Credentials:**\n\nUsername: `admin`\n\nPassword: `arijitwith`")
+        if uses_default_credentials():
+            st.info("**Demo Credentials:**\n\nUsername: `admin`\n\nPassword: `arijitwith`")
         return
     
     # Authenticated - Show dashboard
@@ -321,48 +482,41 @@ def main():
             st.error("❌ Failed to load data from Supabase. Please check your connection.")
             return
         
-        # Prepare data for display
-        df['aispot_id_short'] = df['aispot_id'].str[:8]
-        df['created_at'] = pd.to_datetime(df['created_at']).dt.strftime('%Y-%m-%d %H:%M')
-        
         # Sidebar filters
         search_query = st.sidebar.text_input("🔎 Search", placeholder="Name, city, state...")
         
-        type_options = ["All"] + sorted(df['type_of_place'].dropna().unique().tolist())
-        type_filter = st.sidebar.selectbox("📍 Type of Place", type_options)
+        # Facet options and counts are computed once per data version
+        facet_counts = get_search_index(df).facet_counts
+        
+        def facet_label(counts):
+            return lambda option: option if option == "All" else f"{option} ({counts[option]})"
+        
+        type_options = ["All"] + list(facet_counts['type_of_place'])
+        type_filter = st.sidebar.selectbox("📍 Type of Place", type_options, format_func=facet_label(facet_counts['type_of_place']))
         
         approval_options = ["All", "Approved", "Pending"]
         approval_filter = st.sidebar.selectbox("✅ Approval Status", approval_options)
         
-        state_options = ["All"] + sorted(df['state'].dropna().unique().tolist())
-        state_filter = st.sidebar.selectbox("🗺️ State", state_options)
+        state_options = ["All"] + list(facet_counts['state'])
+        state_filter = st.sidebar.selectbox("🗺️ State", state_options, format_func=facet_label(facet_counts['state']))
         
-        sort_option = st.sidebar.selectbox("🔃 Sort By", ["Date (Newest)", "Date (Oldest)", "Name (A-Z)", "Name (Z-A)"])
+        sort_option = st.sidebar.selectbox("🔃 Sort By", list(SORT_OPTIONS))
         
         if st.sidebar.button("🔄 Refresh Data", use_container_width=True):
             st.cache_data.clear()
+            get_aispot_store().mark_stale(full=True)
             st.rerun()
         
         # Main area
         st.title("🤖 AI Spot Admin Dashboard")
         
         # Display stats
-        display_stats(df)
+        display_stats(get_statistics())
         
         st.markdown("---")
         
-        # Apply filters
-        filtered_df = apply_filters(df, search_query, type_filter, approval_filter, state_filter)
-        
-        # Apply sorting
-        if sort_option == "Date (Newest)":
-            filtered_df = filtered_df.sort_values('created_at', ascending=False)
-        elif sort_option == "Date (Oldest)":
-            filtered_df = filtered_df.sort_values('created_at', ascending=True)
-        elif sort_option == "Name (A-Z)":
-            filtered_df = filtered_df.sort_values('name', ascending=True)
-        elif sort_option == "Name (Z-A)":
-            filtered_df = filtered_df.sort_values('name', ascending=False)
+        # Apply filters and sorting
+        filtered_df = apply_filters(df, search_query, type_filter, approval_filter, state_filter, sort_option)
         
         # Bulk Analytics Email Section
         st.markdown('<div class="bulk-section">', unsafe_allow_html=True)
@@ -373,21 +527,16 @@ def main():
         
         with col_bulk1:
             if st.button("📊 Email All - Today's Data (Last 24 Hours)", use_container_width=True):
-                with st.spinner("Sending analytics emails to all AI Spots..."):
-                    results = send_bulk_analytics_emails(filtered_df.to_dict('records'))
-                    if results['success'] > 0:
-                        st.success(f"✅ Successfully sent to {results['success']} AI Spot(s)")
-                    if results['failed'] > 0:
-                        st.error(f"❌ Failed to send to {results['failed']} AI Spot(s)")
-                        if results['failed_spots']:
-                            st.warning(f"Failed spots: {', '.join(results['failed_spots'])}")
+                job_id = enqueue_bulk_analytics(filtered_df['aispot_id'].tolist())
+                st.success(f"📨 Queued job #{job_id} for {len(filtered_df)} AI Spot(s) - progress is shown under Background Jobs")
         
         with col_bulk2:
             if st.button("📅 Email All - Custom Date Range", use_container_width=True):
                 st.session_state.bulk_date_picker = True
         
         with col_bulk3:
-            st.write("")  # Placeholder
+            if st.button("📦 Export Standees - ZIP / PDF", use_container_width=True):
+                st.session_state.bulk_export_picker = True
         
         # Date picker modal for bulk emails
         if st.session_state.bulk_date_picker:
@@ -405,20 +554,22 @@ def main():
                     start_dt = datetime.combine(bulk_start_date, datetime.min.time())
                     end_dt = datetime.combine(bulk_end_date, datetime.max.time())
                     
-                    with st.spinner("Sending analytics emails..."):
-                        results = send_bulk_analytics_emails(filtered_df.to_dict('records'), start_dt, end_dt)
-                        if results['success'] > 0:
-                            st.success(f"✅ Successfully sent to {results['success']} AI Spot(s)")
-                        if results['failed'] > 0:
-                            st.error(f"❌ Failed to send to {results['failed']} AI Spot(s)")
-                        st.session_state.bulk_date_picker = False
-                        st.rerun()
+                    enqueue_bulk_analytics(filtered_df['aispot_id'].tolist(), start_dt, end_dt)
+                    st.session_state.bulk_date_picker = False
+                    st.rerun()
             
             with col_date4:
                 if st.button("Cancel"):
                     st.session_state.bulk_date_picker = False
                     st.rerun()
         
+        # Bulk standee export
+        if st.session_state.bulk_export_picker:
+            display_bulk_export(filtered_df)
+        
+        # Progress of queued bulk jobs
+        display_jobs()
+        
         st.markdown('</div>', unsafe_allow_html=True)
         
         st.markdown("---")
@@ -496,8 +647,17 @@ def main():
             st.warning("No records match your filters.")
             return
         
+        # Go back to the first page whenever the filters or sort order change
+        table_filters = (search_query, type_filter, approval_filter, state_filter, sort_option)
+        if st.session_state.table_filters != table_filters:
+            st.session_state.table_filters = table_filters
+            st.session_state.table_page = 1
+        
+        # Only the current page's rows get widgets
+        page_df = display_pagination(filtered_df)
+        
         # Display each row with action buttons
-        for idx, row in filtered_df.iterrows():
+        for idx, row in page_df.iterrows():
             # Row styling based on approval status
             row_style = "approved-row" if row['is_approved'] else "pending-row"
             
@@ -507,7 +667,7 @@ def main():
                 
                 with col_info:
                     st.markdown(f"**{row['name']}** ({row['type_of_place']})")
-                    st.caption(f"ID: {row['aispot_id_short']} | Manager: {row['owner_manager_name']} | Email: {row['email']} | Created: {row['created_at']}")
+                    st.caption(f"ID: {row['aispot_id_short']} | Manager: {row['owner_manager_name']} | Email: {row['email']} | Created: {row['created_at_display']}")
                 
                 with col_status:
                     if row['is_approved']:
@@ -576,7 +736,7 @@ def main():
                 with col6:
                     if st.button("📧 Send Email", key=f"email_{row['aispot_id']}", use_container_width=True):
                         with st.spinner("Sending email..."):
-                            success = send_standee_email(row)
+                            success = send_standee_email(get_aispot_by_id(row['aispot_id']) or row)
                             if success:
                                 st.success("✅ Email sent successfully!")
                             else:
@@ -585,7 +745,7 @@ def main():
                 with col7:
                     if st.button("📊 Today's Data", key=f"analytics_today_{row['aispot_id']}", use_container_width=True):
                         with st.spinner("Sending analytics email..."):
-                            success = send_analytics_email(row)
+                            success = send_analytics_email(get_aispot_by_id(row['aispot_id']) or row)
                             if success:
                                 st.success("✅ Analytics email sent!")
                                 time.sleep(1)
@@ -601,3 +761,8 @@ def main():
 
 if __name__ == "__main__":
     main()
+    
+    # Poll running background jobs once the whole page has rendered
+    if st.session_state.get('refresh_jobs'):
+        time.sleep(JOB_PROGRESS_REFRESH_SECONDS)
+        st.rerun()
@@ -0,0 +1,247 @@
+"""
+AI Spot Analytics Email - Command Line Entry Point
+Runs the bulk analytics email pipeline without Streamlit, once or on a daily schedule
+
+Examples:
+    python send_analytics.py                          # last 24 hours, every AI Spot
+    python send_analytics.py --start 2024-06-01 --end 2024-06-07 --approved-only
+    python send_analytics.py --ids <uuid> <uuid> --workers 2
+    python send_analytics.py --schedule 09:00         # daily at 09:00 local time
+
+Exit codes: 0 all emails sent, 1 some emails failed, 2 configuration or data error
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+
+EXIT_OK = 0
+EXIT_PARTIAL_FAILURE = 1
+EXIT_ERROR = 2
+
+logger = logging.getLogger("aispot")
+
+class JSONLogFormatter(logging.Formatter):
+    """One JSON object per log line, including any `fields` passed via extra"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='seconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class KeyValueLogFormatter(logging.Formatter):
+    """Plain log lines with `fields` appended as key=value pairs"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, 'fields', {})
+        if fields:
+            line += " " + " ".join(f"{key}={json.dumps(value, default=str)}" for key, value in fields.items())
+        return line
+
+def setup_logging(log_format: str, verbose: bool):
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JSONLogFormatter() if log_format == 'json' else KeyValueLogFormatter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(logging.DEBUG if verbose else logging.INFO)
+
+    # Keep HTTP client chatter out of the run log
+    for noisy in ('httpx', 'httpcore', 'hpack'):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+
+def parse_datetime(value: str, end_of_day: bool = False) -> datetime:
+    """Parse YYYY-MM-DD (start or end of that day) or an ISO timestamp"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date: {value!r}")
+    if len(value) == 10:
+        return datetime.combine(parsed.date(), datetime.max.time() if end_of_day else datetime.min.time())
+    return parsed
+
+def parse_schedule(value: str):
+    try:
+        return datetime.strptime(value, "%H:%M").time()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time (expected HH:MM): {value!r}")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Send AI Spot analytics emails (quiz responses) without starting Streamlit."
+    )
+
+    window = parser.add_argument_group("date window (default: last 24 hours)")
+    start_or_since = window.add_mutually_exclusive_group()
+    start_or_since.add_argument("--start", type=parse_datetime, help="Start date (YYYY-MM-DD) or ISO timestamp")
+    window.add_argument("--end", type=lambda v: parse_datetime(v, end_of_day=True), help="End date (YYYY-MM-DD, inclusive) or ISO timestamp")
+    start_or_since.add_argument("--since-hours", type=float, help="Window of the last N hours (instead of --start/--end)")
+
+    spots = parser.add_argument_group("AI Spots (default: all)")
+    spots.add_argument("--ids", nargs="+", metavar="AISPOT_ID", help="Only these AI Spot IDs")
+    spots.add_argument("--approved-only", action="store_true", help="Only approved AI Spots")
+
+    parser.add_argument("--workers", type=int, help="Concurrent sends (default: ANALYTICS_EMAIL_WORKERS)")
+    parser.add_argument("--dry-run", action="store_true", help="Resolve spots and count responses, but send nothing")
+    parser.add_argument("--schedule", type=parse_schedule, metavar="HH:MM", help="Run every day at this local time instead of once")
+    parser.add_argument("--log-format", choices=("text", "json"), default="text", help="Log line format (default: text)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Debug logging")
+    return parser
+
+def resolve_window(args) -> tuple:
+    """
+    Date window for one run (evaluated at run time, so schedules move forward)
+
+    Returns (None, None) for the default window, so emails describe it as today.
+    A missing bound is filled in: end defaults to now, start to 24 hours before end.
+    """
+    if args.since_hours is not None:
+        end = datetime.now()
+        return end - timedelta(hours=args.since_hours), end
+    if args.start is None and args.end is None:
+        return None, None
+    end = args.end or datetime.now()
+    return args.start or end - timedelta(days=1), end
+
+def load_spots(args) -> List[Dict]:
+    from utils.data_access import fetch_aispot_records, fetch_aispots
+
+    if args.ids:
+        spots = fetch_aispot_records(args.ids)
+        missing = set(args.ids) - {spot['aispot_id'] for spot in spots}
+        for aispot_id in sorted(missing):
+            logger.warning("AI Spot not found", extra={'fields': {'aispot_id': aispot_id}})
+        if args.approved_only:
+            spots = [spot for spot in spots if spot.get('is_approved')]
+        return spots
+
+    return fetch_aispots(approved_only=args.approved_only)
+
+def run_once(args) -> int:
+    """
+    Run one bulk analytics email pass
+
+    Returns:
+        int: Exit code
+    """
+    from utils.analytics_email import fetch_quiz_responses_bulk, resolve_date_range, send_bulk_analytics_emails
+
+    started = time.perf_counter()
+    window_start, window_end = resolve_window(args)
+    start_date, end_date = resolve_date_range(window_start, window_end)
+    window = {'start': start_date.isoformat(timespec='seconds'), 'end': end_date.isoformat(timespec='seconds')}
+
+    try:
+        spots = load_spots(args)
+    except Exception as e:
+        logger.error(f"Could not load AI Spots: {e}", extra={'fields': window})
+        return EXIT_ERROR
+
+    logger.info("Run started", extra={'fields': dict(window, spots=len(spots), dry_run=args.dry_run)})
+    if not spots:
+        logger.info("No AI Spots to email", extra={'fields': window})
+        return EXIT_OK
+
+    if args.dry_run:
+        grouped = fetch_quiz_responses_bulk([spot['aispot_id'] for spot in spots], start_date, end_date)
+        if grouped is None:
+            return EXIT_ERROR
+        for spot in spots:
+            logger.info("Would send", extra={'fields': {
+                'aispot_id': spot['aispot_id'],
+                'name': spot.get('name', ''),
+                'email': spot.get('email', ''),
+                'responses': len(grouped.get(spot['aispot_id'], []))
+            }})
+        logger.info("Dry run finished", extra={'fields': {'spots': len(spots), 'seconds': round(time.perf_counter() - started, 3)}})
+        return EXIT_OK
+
+    def on_result(entry: Dict):
+        level = logging.INFO if entry['success'] else logging.ERROR
+        logger.log(level, "Spot sent" if entry['success'] else "Spot failed", extra={'fields': entry})
+
+    results = send_bulk_analytics_emails(spots, window_start, window_end, max_workers=args.workers, on_result=on_result)
+
+    seconds = time.perf_counter() - started
+    summary = {
+        'spots': len(spots),
+        'success': results['success'],
+        'failed': results['failed'],
+        'seconds': round(seconds, 3),
+        'spots_per_minute': round(len(spots) / seconds * 60, 1) if seconds > 0 else None
+    }
+    logger.info("Run finished", extra={'fields': dict(window, **summary)})
+
+    return EXIT_PARTIAL_FAILURE if results['failed'] else EXIT_OK
+
+def next_run_at(run_time, now: Optional[datetime] = None) -> datetime:
+    """Next occurrence of run_time (today if still ahead, otherwise tomorrow)"""
+    now = now or datetime.now()
+    candidate = datetime.combine(now.date(), run_time)
+    if candidate <= now:
+        candidate = datetime.combine(now.date() + timedelta(days=1), run_time)
+    return candidate
+
+def run_scheduled(args) -> int:
+    """Run every day at args.schedule until interrupted"""
+    while True:
+        run_at = next_run_at(args.schedule)
+        logger.info("Next run scheduled", extra={'fields': {'run_at': run_at.isoformat(timespec='seconds')}})
+        while True:
+            remaining = (run_at - datetime.now()).total_seconds()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, 60))
+
+        code = run_once(args)
+        logger.info("Scheduled run exited", extra={'fields': {'exit_code': code}})
+
+def check_config(args) -> bool:
+    """Check the settings a run needs before touching any AI Spot"""
+    from utils.config import get_email_config
+
+    if not args.dry_run and not get_email_config()['password']:
+        logger.error("SMTP password not configured (set SMTP_PASSWORD)")
+        return False
+    return True
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.since_hours is not None and args.end is not None:
+        parser.error("argument --end: not allowed with argument --since-hours")
+    load_dotenv()
+    setup_logging(args.log_format, args.verbose)
+
+    if not check_config(args):
+        return EXIT_ERROR
+
+    try:
+        if args.schedule:
+            return run_scheduled(args)
+        return run_once(args)
+    except KeyboardInterrupt:
+        logger.info("Interrupted")
+        return EXIT_ERROR
+    except Exception:
+        logger.exception("Run failed")
+        return EXIT_ERROR
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,35 +1,30 @@
 """
 Utility modules for AI Spot Admin Dashboard
+
+Submodules are imported on first use, so headless scripts can use
+utils.analytics_email without loading Streamlit.
 """
 
-from .database import (
-    get_supabase_client,
-    load_aispot_data,
-    update_approval_status,
-    update_aispot_record,
-    get_aispot_by_id,
-    get_statistics
-)
+import importlib
 
-from .pdf_generator import (
-    generate_standee_pdf,
-    generate_preview_html
-)
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'get_supabase_client': 'database',
+    'load_aispot_data': 'database',
+    'update_approval_status': 'database',
+    'update_aispot_record': 'database',
+    'get_aispot_by_id': 'database',
+    'get_statistics': 'database',
+    'generate_standee_pdf': 'pdf_generator',
+    'generate_preview_html': 'pdf_generator',
+    'send_standee_email': 'email_sender',
+    'test_email_configuration': 'email_sender'
+}
 
-from .email_sender import (
-    send_standee_email,
-    test_email_configuration
-)
+__all__ = list(_EXPORTS)
 
-__all__ = [
-    'get_supabase_client',
-    'load_aispot_data',
-    'update_approval_status',
-    'update_aispot_record',
-    'get_aispot_by_id',
-    'get_statistics',
-    'generate_standee_pdf',
-    'generate_preview_html',
-    'send_standee_email',
-    'test_email_configuration'
-]
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
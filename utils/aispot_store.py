@@ -0,0 +1,361 @@
+"""
+AI Spot data store module
+Keeps a snapshot of aispot_master in memory and refreshes it with delta syncs
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import pandas as pd
+from utils.data_access import AISPOT_TABLE, fetch_all_pages
+
+# Columns held in the listing snapshot: what the dashboard table, filters
+# and standee rendering read. Wide fields (address, telephone, price,
+# ...) are fetched per record with get_aispot_by_id when a form or email needs them.
+LISTING_COLUMNS = (
+    'aispot_id',
+    'name',
+    'type_of_place',
+    'owner_manager_name',
+    'email',
+    'city',
+    'state',
+    'is_approved',
+    'qr_code_link',
+    'created_at',
+    'updated_at'
+)
+
+# Listing column dtypes: low-cardinality text as categoricals, the approval
+# flag as bool and timestamps as UTC datetime64
+CATEGORY_COLUMNS = ('type_of_place', 'city', 'state')
+BOOL_COLUMNS = ('is_approved',)
+DATETIME_COLUMNS = ('created_at', 'updated_at')
+
+# Full records kept for get_aispot_by_id (least recently used are dropped)
+AISPOT_RECORD_CACHE_SIZE = int(os.getenv("AISPOT_RECORD_CACHE_SIZE", "2000"))
+
+# Format of the created_at_display column
+CREATED_AT_DISPLAY_FORMAT = '%Y-%m-%d %H:%M'
+
+# How often to look for changed rows, and how often to reload everything
+# (the full reconcile also picks up rows deleted by other clients)
+AISPOT_DELTA_SYNC_SECONDS = float(os.getenv("AISPOT_DELTA_SYNC_SECONDS", "60"))
+AISPOT_FULL_SYNC_SECONDS = float(os.getenv("AISPOT_FULL_SYNC_SECONDS", "1800"))
+
+def to_timestamp(value):
+    """Parse a Supabase timestamp (naive values are taken as UTC)"""
+    return pd.to_datetime(value, utc=True, errors='coerce', format='ISO8601')
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert listing columns to compact dtypes (in place)
+
+    Args:
+        df: DataFrame built from aispot_master rows
+
+    Returns:
+        The same DataFrame
+    """
+    for column in CATEGORY_COLUMNS:
+        if column in df:
+            df[column] = df[column].astype('category')
+    for column in BOOL_COLUMNS:
+        if column in df:
+            df[column] = df[column].fillna(False).astype(bool)
+    for column in DATETIME_COLUMNS:
+        if column in df:
+            df[column] = to_timestamp(df[column])
+    return df
+
+def format_created_at(created_at: pd.Series) -> pd.Series:
+    """Display strings for a created_at column ('' when missing)"""
+    return created_at.dt.strftime(CREATED_AT_DISPLAY_FORMAT).fillna('')
+
+def add_display_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the columns the dashboard shows but does not sort or filter on (in place)
+
+    aispot_id_short is the first 8 characters of the id, and
+    created_at_display is created_at formatted with CREATED_AT_DISPLAY_FORMAT
+    (created_at itself stays datetime64 for sorting).
+
+    Args:
+        df: DataFrame after compact_frame
+
+    Returns:
+        The same DataFrame
+    """
+    if 'aispot_id' in df:
+        df['aispot_id_short'] = df['aispot_id'].str[:8]
+    if 'created_at' in df:
+        df['created_at_display'] = format_created_at(df['created_at'])
+    return df
+
+class AispotDataStore:
+    """
+    In-memory snapshot of aispot_master with a high-water mark
+
+    The first load (and every full reconcile) pages through the whole
+    table. In between, a refresh only fetches rows whose updated_at or
+    created_at is at or after the high-water mark and merges them into
+    the snapshot by aispot_id. Writes made through this app are patched
+    into the snapshot directly (apply_update / remove). `version`
+    increases whenever the snapshot changes (it is also stored in
+    df.attrs['version'], which survives copies). derived() memoizes
+    values computed from the snapshot until the next change.
+
+    Snapshots are never modified once published: every change builds a new
+    DataFrame (patches share the untouched columns), so callers can read
+    the frame returned by refresh without copying it.
+
+    Alongside the snapshot the store keeps an aispot_id -> row position
+    index, used internally to patch rows in place, and an LRU cache of
+    full records (get_record / put_records), both kept in sync by syncs
+    and write patches. Record lookups go through the LRU cache because the
+    snapshot only holds the projected listing columns.
+    """
+
+    def __init__(self, get_client: Callable,
+                 columns: Sequence[str] = LISTING_COLUMNS,
+                 delta_interval: float = AISPOT_DELTA_SYNC_SECONDS,
+                 full_interval: float = AISPOT_FULL_SYNC_SECONDS):
+        self._get_client = get_client
+        self.columns = tuple(columns)
+        self._select = ','.join(self.columns)
+        self.delta_interval = delta_interval
+        self.full_interval = full_interval
+
+        self.df: Optional[pd.DataFrame] = None
+        self.high_water_mark: Optional[str] = None
+        self.version = 0
+
+        self._last_full_sync = 0.0
+        self._last_delta_sync = 0.0
+        self._stale = False
+        self._lock = threading.RLock()
+
+        self._derived: Dict[str, Any] = {}
+        self._derived_version = None
+
+        self._positions: Dict[str, int] = {}
+        self._records: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def _reindex(self):
+        """Rebuild the aispot_id -> row position index after rows move"""
+        self._positions = {aispot_id: position for position, aispot_id in enumerate(self.df['aispot_id'])}
+
+    def _bump_version(self):
+        self.version += 1
+        self.df.attrs['version'] = self.version
+
+    def _advance_high_water_mark(self, rows: List[dict]):
+        for row in rows:
+            for column in ('updated_at', 'created_at'):
+                value = row.get(column)
+                if value and (self.high_water_mark is None or value > self.high_water_mark):
+                    self.high_water_mark = value
+
+    def _full_sync(self):
+        # aispot_id breaks created_at ties (bulk inserts share now()), so
+        # offset pages never overlap or skip rows
+        client = self._get_client()
+        rows = fetch_all_pages(
+            lambda count: client.table(AISPOT_TABLE).select(self._select, count=count)
+            .order('created_at', desc=True).order('aispot_id')
+        )
+
+        self.high_water_mark = None
+        self._advance_high_water_mark(rows)
+        self.df = add_display_columns(compact_frame(pd.DataFrame(rows, columns=list(self.columns))))
+        self._reindex()
+        self._records.clear()
+        self._bump_version()
+
+        now = time.monotonic()
+        self._last_full_sync = now
+        self._last_delta_sync = now
+
+    def _delta_sync(self):
+        if self.high_water_mark is None:
+            self._full_sync()
+            return
+
+        client = self._get_client()
+        mark = self.high_water_mark
+        rows = fetch_all_pages(
+            lambda count: client.table(AISPOT_TABLE)
+            .select(self._select, count=count)
+            .or_(f"updated_at.gte.{mark},created_at.gte.{mark}")
+            .order('created_at', desc=True)
+            .order('aispot_id')
+        )
+        self._last_delta_sync = time.monotonic()
+
+        if rows:
+            self._merge(rows)
+            self._advance_high_water_mark(rows)
+
+    def _merge(self, rows: List[dict]):
+        """Replace or append changed rows by aispot_id, keeping newest-first order"""
+        changed = add_display_columns(compact_frame(pd.DataFrame(rows, columns=list(self.columns))))
+        if self.df is None or self.df.empty:
+            merged = changed
+        else:
+            replaced = self.df['aispot_id'].isin(changed['aispot_id'])
+            kept = self.df[~replaced]
+            # Categoricals with different categories concatenate as object
+            merged = compact_frame(pd.concat([kept, changed], ignore_index=True))
+
+        self.df = merged.sort_values('created_at', ascending=False, ignore_index=True)
+        self._reindex()
+        for aispot_id in changed['aispot_id']:
+            self._records.pop(aispot_id, None)
+        self._bump_version()
+
+    def apply_update(self, aispot_id: str, changes: Dict):
+        """
+        Patch one record in the snapshot after a successful update
+
+        The high-water mark is left alone (changes carry this machine's
+        clock), so the next delta sync re-reads the row from the server.
+
+        Args:
+            aispot_id: UUID of the AI Spot
+            changes: Column values to set (or the updated row returned by
+                Supabase); columns outside the projection are ignored
+        """
+        with self._lock:
+            record = self._records.get(aispot_id)
+            if record is not None:
+                self._records[aispot_id] = dict(record, **changes)
+
+            position = self._positions.get(aispot_id)
+            if position is None:
+                self._stale = True  # Not in the snapshot yet; fetch it on the next refresh
+                return
+
+            # Copy-on-write: only the patched columns are replaced
+            df = self.df.copy(deep=False)
+            for column, value in changes.items():
+                if column not in self.columns:
+                    continue
+                series = df[column].copy()
+                if column in DATETIME_COLUMNS:
+                    value = to_timestamp(value)
+                elif column in BOOL_COLUMNS:
+                    value = bool(value)
+                elif isinstance(series.dtype, pd.CategoricalDtype):
+                    if value is not None and value not in series.cat.categories:
+                        series = series.cat.add_categories([value])
+                series.iloc[position] = value
+                df[column] = series
+
+            if 'created_at' in changes and 'created_at_display' in df:
+                display = df['created_at_display'].copy()
+                display.iloc[position] = format_created_at(df['created_at'].iloc[[position]]).iloc[0]
+                df['created_at_display'] = display
+
+            self.df = df
+            self._bump_version()
+
+    def remove(self, aispot_id: str):
+        """
+        Drop one record from the snapshot after a successful delete
+
+        Args:
+            aispot_id: UUID of the AI Spot
+        """
+        with self._lock:
+            self._records.pop(aispot_id, None)
+
+            position = self._positions.get(aispot_id)
+            if position is None:
+                return
+
+            self.df = self.df.drop(index=self.df.index[position]).reset_index(drop=True)
+            self._reindex()
+            self._bump_version()
+
+    def get_record(self, aispot_id: str) -> Optional[Dict]:
+        """
+        Get a cached full record
+
+        Args:
+            aispot_id: UUID of the AI Spot
+
+        Returns:
+            dict: Copy of the record, or None if it is not cached
+        """
+        with self._lock:
+            record = self._records.get(aispot_id)
+            if record is None:
+                return None
+            self._records.move_to_end(aispot_id)
+            return dict(record)
+
+    def put_records(self, records: List[Dict]):
+        """
+        Cache full records fetched from Supabase
+
+        Args:
+            records: Rows of aispot_master (all columns)
+        """
+        with self._lock:
+            for record in records:
+                self._records[record['aispot_id']] = dict(record)
+                self._records.move_to_end(record['aispot_id'])
+            while len(self._records) > AISPOT_RECORD_CACHE_SIZE:
+                self._records.popitem(last=False)
+
+    def derived(self, key: str, builder: Callable[[pd.DataFrame], Any]) -> Any:
+        """
+        Memoize a value computed from the current snapshot
+
+        Args:
+            key: Name of the derived value
+            builder: Called with the snapshot DataFrame on a miss
+
+        Returns:
+            The value built for the current version
+        """
+        with self._lock:
+            if self._derived_version != self.version:
+                self._derived = {}
+                self._derived_version = self.version
+            if key not in self._derived:
+                self._derived[key] = builder(self.df)
+            return self._derived[key]
+
+    def mark_stale(self, full: bool = False):
+        """
+        Sync on the next refresh regardless of the interval
+
+        Args:
+            full: Reload the whole table (needed after deletes, which a
+                delta sync cannot see)
+        """
+        self._stale = True
+        if full:
+            self._last_full_sync = 0.0
+
+    def refresh(self, full: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Bring the snapshot up to date if it is due and return it
+
+        Args:
+            full: Force a full reload instead of a delta sync
+
+        Returns:
+            DataFrame snapshot (shared and read-only; callers must not mutate it)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if full or self.df is None or now - self._last_full_sync >= self.full_interval:
+                self._full_sync()
+            elif self._stale or now - self._last_delta_sync >= self.delta_interval:
+                self._delta_sync()
+            self._stale = False
+            return self.df
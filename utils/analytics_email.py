@@ -6,54 +6,182 @@ Sends quiz response data and analytics to AI Spot owners
 import os
 import io
 import csv
-import smtplib
+import gzip
+import base64
+import shutil
+import zipfile
+import tempfile
+from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.mime.application import MIMEApplication
-from typing import Dict, List, Optional
+import time
+from functools import lru_cache
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
-import streamlit as st
-from supabase import create_client, Client
+from utils.config import get_email_config
+from utils.data_access import QUIZ_RESPONSES_TABLE, fetch_all_pages, get_supabase_client, iter_pages
+from utils.smtp_pool import send_email_message
+from utils.ui_feedback import show_error, show_success
 
-def get_email_config():
-    """Get email configuration from Streamlit secrets or environment variables"""
-    try:
-        if hasattr(st, 'secrets') and 'SMTP_HOST' in st.secrets:
-            return {
-                'host': st.secrets['SMTP_HOST'],
-                'port': int(st.secrets['SMTP_PORT']),
-                'use_ssl': st.secrets.get('SMTP_USE_SSL', True),
-                'email': st.secrets['SMTP_EMAIL'],
-                'password': st.secrets['SMTP_PASSWORD'],
-                'bcc': st.secrets['SMTP_BCC']
-            }
-    except:
-        pass
-    
-    return {
-        'host': os.getenv("SMTP_HOST", "smtpout.secureserver.net"),
-        'port': int(os.getenv("SMTP_PORT", "465")),
-        'use_ssl': os.getenv("SMTP_USE_SSL", "True").lower() == "true",
-        'email': os.getenv("SMTP_EMAIL", "ai@withArijit.com"),
-        'password': os.getenv("SMTP_PASSWORD", ""),
-        'bcc': os.getenv("SMTP_BCC", "star.analytix.ai@gmail.com")
-    }
+# Concurrent sends for bulk analytics runs
+ANALYTICS_EMAIL_WORKERS = int(os.getenv("ANALYTICS_EMAIL_WORKERS", "4"))
+
+# Bulk quiz response fetching
+QUIZ_PAGE_SIZE = 1000  # PostgREST default max rows per request
+QUIZ_ID_CHUNK_SIZE = 150  # Keeps the in_ filter URL well under server limits
+QUIZ_WINDOW_SCAN_THRESHOLD = 600  # Above this many spots, scan the whole window instead
+
+# Analytics email body
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates')
+ANALYTICS_EMAIL_TEMPLATE = 'analytics_email.html'
+ANALYTICS_MAX_INLINE_ROWS = int(os.getenv("ANALYTICS_MAX_INLINE_ROWS", "200"))  # Rest only in the CSV
+
+# Columns the analytics email and CSV use
+QUIZ_RESPONSE_COLUMNS = 'name,email,mobile,age,occupation,score,readiness_level,created_at'
+
+# CSV attachments
+ANALYTICS_CSV_SPOOL_BYTES = 1024 * 1024  # Kept in memory up to this size, then spooled to disk
+ANALYTICS_CSV_COMPRESSION = os.getenv("ANALYTICS_CSV_COMPRESSION", "none").lower()  # none, gzip or zip
+ANALYTICS_CSV_COMPRESS_BYTES = int(os.getenv("ANALYTICS_CSV_COMPRESS_BYTES", str(256 * 1024)))
+ATTACHMENT_CHUNK_BYTES = 57 * 1024  # Multiple of 57 bytes, so each base64 chunk ends on a full line
+
+# How the default window (no dates given) is described in emails
+DEFAULT_DATE_RANGE_TEXT = "today (last 24 hours)"
+
+def resolve_date_range(start_date: Optional[datetime] = None, end_date: Optional[datetime] = None):
+    """Resolve optional start/end dates to a concrete window (end defaults to now, start to 24 hours before end)"""
+    if end_date is None:
+        end_date = datetime.now()
+    if start_date is None:
+        start_date = end_date - timedelta(days=1)
+    return start_date, end_date
+
+def describe_date_range(start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> str:
+    """Wording of a window in emails ("today (last 24 hours)" when no dates are given)"""
+    if start_date is None and end_date is None:
+        return DEFAULT_DATE_RANGE_TEXT
+    start_date, end_date = resolve_date_range(start_date, end_date)
+    return f"{start_date.strftime('%b %d')} - {end_date.strftime('%b %d, %Y')}"
 
-def get_supabase_client() -> Client:
-    """Get Supabase client"""
+def fetch_quiz_responses_bulk(aispot_ids: List[str], start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> Optional[Dict[str, List[Dict]]]:
+    """
+    Fetch quiz responses for many AI Spots in a few paginated queries
+    
+    Small id sets are fetched with chunked in_ filters; large ones with a single
+    window-only scan filtered in memory.
+    
+    Args:
+        aispot_ids: AI Spot IDs to fetch responses for
+        start_date: Start date (None for last 24 hours)
+        end_date: End date (None for now)
+    
+    Returns:
+        Dict mapping aispot_id to its responses (newest first), or None on failure
+    """
     try:
-        if hasattr(st, 'secrets'):
-            url = st.secrets.get("SUPABASE_URL")
-            key = st.secrets.get("SUPABASE_KEY")
+        supabase = get_supabase_client()
+        if not supabase:
+            return None
+        
+        start_date, end_date = resolve_date_range(start_date, end_date)
+        wanted = set(aid for aid in aispot_ids if aid)
+        grouped = {aid: [] for aid in wanted}
+        if not wanted:
+            return grouped
+        
+        def window_query(count=None):
+            return supabase.table(QUIZ_RESPONSES_TABLE)\
+                .select(f"aispot_id,{QUIZ_RESPONSE_COLUMNS}", count=count)\
+                .gte('created_at', start_date.isoformat())\
+                .lte('created_at', end_date.isoformat())\
+                .order('created_at', desc=True)\
+                .order('id')
+        
+        if len(wanted) > QUIZ_WINDOW_SCAN_THRESHOLD:
+            records = fetch_all_pages(window_query, QUIZ_PAGE_SIZE)
         else:
-            url = os.getenv("SUPABASE_URL")
-            key = os.getenv("SUPABASE_KEY")
+            ids = sorted(wanted)
+            records = []
+            for i in range(0, len(ids), QUIZ_ID_CHUNK_SIZE):
+                chunk = ids[i:i + QUIZ_ID_CHUNK_SIZE]
+                records.extend(fetch_all_pages(lambda count: window_query(count).in_('aispot_id', chunk), QUIZ_PAGE_SIZE))
         
-        return create_client(url, key)
+        for record in records:
+            aid = record.get('aispot_id')
+            if aid in grouped:
+                grouped[aid].append(record)
+        
+        # Chunks are fetched separately, so restore newest-first order per spot
+        for responses in grouped.values():
+            responses.sort(key=lambda r: r.get('created_at') or '', reverse=True)
+        
+        return grouped
+    
     except Exception as e:
-        st.error(f"Failed to create Supabase client: {str(e)}")
+        show_error(f"Error fetching quiz responses in bulk: {str(e)}")
         return None
 
+class QuizResponseStream:
+    """
+    One AI Spot's quiz responses in a date window, fetched lazily page by page
+    
+    Iterating runs range-paginated queries (newest first, QUIZ_PAGE_SIZE rows
+    each) and yields records as pages arrive, so windows of any size are
+    complete and only one page is held at a time. The first request also
+    asks for the exact row count, available as total once iteration starts.
+    Each iteration queries again.
+    """
+    
+    def __init__(self, aispot_id: str, start_date: datetime, end_date: datetime, columns: str = QUIZ_RESPONSE_COLUMNS, page_size: int = QUIZ_PAGE_SIZE):
+        self.aispot_id = aispot_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.columns = columns
+        self.page_size = page_size
+        self.total: Optional[int] = None
+        self.pages = 0
+        self.fetched = 0
+    
+    def _query(self, count: Optional[str]):
+        supabase = get_supabase_client()
+        if not supabase:
+            raise ConnectionError("Supabase client unavailable")
+        return supabase.table(QUIZ_RESPONSES_TABLE)\
+            .select(self.columns, count=count)\
+            .eq('aispot_id', self.aispot_id)\
+            .gte('created_at', self.start_date.isoformat())\
+            .lte('created_at', self.end_date.isoformat())\
+            .order('created_at', desc=True)\
+            .order('id')
+    
+    def __iter__(self) -> Iterator[Dict]:
+        self.pages = 0
+        self.fetched = 0
+        for response in iter_pages(self._query, self.page_size, count='exact'):
+            if self.pages == 0 and response.count is not None:
+                self.total = response.count
+            self.pages += 1
+            self.fetched += len(response.data or [])
+            yield from response.data or []
+
+def iter_quiz_responses(aispot_id: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, columns: str = QUIZ_RESPONSE_COLUMNS) -> QuizResponseStream:
+    """
+    Stream quiz responses for an AI Spot within date range
+    
+    Args:
+        aispot_id: AI Spot ID
+        start_date: Start date (None for last 24 hours)
+        end_date: End date (None for now)
+        columns: Columns to select
+    
+    Returns:
+        QuizResponseStream: Iterable of response records (newest first) with a total count
+    """
+    start_date, end_date = resolve_date_range(start_date, end_date)
+    return QuizResponseStream(aispot_id, start_date, end_date, columns)
+
 def fetch_quiz_responses(aispot_id: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Dict]:
     """
     Fetch quiz responses for an AI Spot within date range
@@ -67,60 +195,45 @@ def fetch_quiz_responses(aispot_id: str, start_date: Optional[datetime] = None,
         List of quiz response records
     """
     try:
-        supabase = get_supabase_client()
-        if not supabase:
-            return []
-        
-        # Default to last 24 hours if no dates provided
-        if start_date is None:
-            start_date = datetime.now() - timedelta(days=1)
-        if end_date is None:
-            end_date = datetime.now()
-        
-        # Query quiz responses
-        response = supabase.table('quiz_responses')\
-            .select('*')\
-            .eq('aispot_id', aispot_id)\
-            .gte('created_at', start_date.isoformat())\
-            .lte('created_at', end_date.isoformat())\
-            .order('created_at', desc=True)\
-            .execute()
-        
-        return response.data if response.data else []
+        return list(iter_quiz_responses(aispot_id, start_date, end_date))
     
     except Exception as e:
-        st.error(f"Error fetching quiz responses: {str(e)}")
+        show_error(f"Error fetching quiz responses: {str(e)}")
         return []
 
-def create_csv_from_responses(responses: List[Dict], aispot_name: str) -> bytes:
+CSV_HEADER = [
+    'Responder Name',
+    'Email',
+    'Mobile',
+    'Age',
+    'Occupation',
+    'Score',
+    'Readiness Level',
+    'Created At',
+    'AI Spot Name'
+]
+
+def write_responses_csv(responses: Iterable[Dict], aispot_name: str, output: BinaryIO) -> int:
     """
-    Create CSV file from quiz responses
+    Stream quiz responses as UTF-8 CSV rows into a binary file
+    
+    Rows are encoded as they are written, so responses can be a generator
+    and nothing but the current row is held in memory.
     
     Args:
-        responses: List of quiz response records
+        responses: Quiz response records (any iterable)
         aispot_name: AI Spot name
+        output: Writable binary file
     
     Returns:
-        CSV file as bytes
+        int: Number of data rows written
     """
+    text = io.TextIOWrapper(output, encoding='utf-8', newline='', write_through=True)
     try:
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Header
-        writer.writerow([
-            'Responder Name',
-            'Email',
-            'Mobile',
-            'Age',
-            'Occupation',
-            'Score',
-            'Readiness Level',
-            'Created At',
-            'AI Spot Name'
-        ])
+        writer = csv.writer(text)
+        writer.writerow(CSV_HEADER)
         
-        # Data rows
+        rows = 0
         for resp in responses:
             writer.writerow([
                 resp.get('name', ''),
@@ -133,179 +246,240 @@ def create_csv_from_responses(responses: List[Dict], aispot_name: str) -> bytes:
                 resp.get('created_at', ''),
                 aispot_name
             ])
+            rows += 1
+        return rows
+    finally:
+        # Leave the caller's file open
+        text.detach()
+
+def spool_csv_from_responses(responses: Iterable[Dict], aispot_name: str) -> BinaryIO:
+    """
+    Write the responses CSV to a spooled temporary file
+    
+    The file stays in memory up to ANALYTICS_CSV_SPOOL_BYTES and moves to
+    disk beyond that. The caller must close it.
+    
+    Returns:
+        Temporary file positioned at the start of the CSV
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=ANALYTICS_CSV_SPOOL_BYTES)
+    try:
+        write_responses_csv(responses, aispot_name, spool)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+def _file_size(f: BinaryIO) -> int:
+    position = f.tell()
+    size = f.seek(0, io.SEEK_END)
+    f.seek(position)
+    return size
+
+def _compress_csv(spool: BinaryIO, csv_filename: str, mode: str) -> Tuple[BinaryIO, str, str]:
+    """
+    Compress a spooled CSV chunk by chunk into a new spooled file
+    
+    Returns:
+        Tuple of (compressed file at position 0, attachment filename, MIME subtype)
+    """
+    compressed = tempfile.SpooledTemporaryFile(max_size=ANALYTICS_CSV_SPOOL_BYTES)
+    try:
+        if mode == 'zip':
+            with zipfile.ZipFile(compressed, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                with archive.open(csv_filename, 'w') as entry:
+                    shutil.copyfileobj(spool, entry, ATTACHMENT_CHUNK_BYTES)
+            filename, subtype = f"{csv_filename}.zip", 'zip'
+        else:
+            with gzip.GzipFile(filename=csv_filename, mode='wb', fileobj=compressed) as archive:
+                shutil.copyfileobj(spool, archive, ATTACHMENT_CHUNK_BYTES)
+            filename, subtype = f"{csv_filename}.gz", 'gzip'
+    except Exception:
+        compressed.close()
+        raise
+    compressed.seek(0)
+    return compressed, filename, subtype
+
+def _base64_payload(f: BinaryIO) -> str:
+    """Base64-encode a file in line-aligned chunks (76-character lines, as email expects)"""
+    chunks = []
+    while True:
+        chunk = f.read(ATTACHMENT_CHUNK_BYTES)
+        if not chunk:
+            break
+        chunks.append(base64.encodebytes(chunk).decode('ascii'))
+    return ''.join(chunks)
+
+def _build_csv_attachment(responses: Iterable[Dict], aispot_name: str, csv_filename: str) -> MIMEBase:
+    """Build the CSV attachment (see create_csv_attachment); errors propagate"""
+    spool = spool_csv_from_responses(responses, aispot_name)
+    try:
+        filename, subtype = csv_filename, 'csv'
+        
+        if ANALYTICS_CSV_COMPRESSION in ('gzip', 'zip') and _file_size(spool) > ANALYTICS_CSV_COMPRESS_BYTES:
+            compressed, filename, subtype = _compress_csv(spool, csv_filename, ANALYTICS_CSV_COMPRESSION)
+            spool.close()
+            spool = compressed
         
-        return output.getvalue().encode('utf-8')
+        attachment = MIMEBase('application', subtype)
+        attachment.set_payload(_base64_payload(spool))
+        attachment['Content-Transfer-Encoding'] = 'base64'
+        attachment.add_header('Content-Disposition', 'attachment', filename=filename)
+        return attachment
+    
+    finally:
+        spool.close()
+
+def create_csv_attachment(responses: Iterable[Dict], aispot_name: str, csv_filename: str) -> Optional[MIMEBase]:
+    """
+    Create the CSV attachment for an analytics email
+    
+    The CSV is streamed to a spooled temporary file and base64-encoded from
+    there, so only the encoded payload is held in memory. When
+    ANALYTICS_CSV_COMPRESSION is 'gzip' or 'zip' and the CSV is larger than
+    ANALYTICS_CSV_COMPRESS_BYTES, the compressed file is attached instead.
+    
+    Args:
+        responses: Quiz response records (any iterable)
+        aispot_name: AI Spot name
+        csv_filename: Attachment filename for the plain CSV
+    
+    Returns:
+        MIME attachment part, or None on failure
+    """
+    try:
+        return _build_csv_attachment(responses, aispot_name, csv_filename)
     
     except Exception as e:
-        st.error(f"Error creating CSV: {str(e)}")
+        show_error(f"Error creating CSV: {str(e)}")
         return None
 
-def create_analytics_email_html(aispot_data: Dict, responses: List[Dict], date_range_text: str) -> str:
+def create_csv_from_responses(responses: Iterable[Dict], aispot_name: str) -> bytes:
+    """
+    Create CSV file from quiz responses
+    
+    Args:
+        responses: Quiz response records (any iterable)
+        aispot_name: AI Spot name
+    
+    Returns:
+        CSV file as bytes
+    """
+    try:
+        with spool_csv_from_responses(responses, aispot_name) as spool:
+            return spool.read()
+    
+    except Exception as e:
+        show_error(f"Error creating CSV: {str(e)}")
+        return None
+
+@lru_cache(maxsize=1)
+def _template_environment() -> Environment:
+    """Jinja2 environment for the email templates (compiled templates are cached and reloaded when changed)"""
+    return Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(('html',)),
+        finalize=lambda value: '' if value is None else value
+    )
+
+def create_analytics_email_html(aispot_data: Dict, responses: List[Dict], date_range_text: str, total: Optional[int] = None) -> str:
     """
     Create HTML email with analytics
     
+    Renders templates/analytics_email.html. At most ANALYTICS_MAX_INLINE_ROWS
+    responses are shown in the table, with a note that the full list is in
+    the attached CSV.
+    
     Args:
         aispot_data: AI Spot record
-        responses: List of quiz responses
+        responses: List of quiz responses (newest first)
         date_range_text: Text describing date range (e.g., "today" or "Dec 1-5, 2024")
+        total: Total responses in the window (None for len(responses))
     
     Returns:
         HTML email content
     """
+    return _template_environment().get_template(ANALYTICS_EMAIL_TEMPLATE).render(
+        name=aispot_data.get('name', ''),
+        manager_name=aispot_data.get('owner_manager_name', ''),
+        count=len(responses) if total is None else total,
+        date_range_text=date_range_text,
+        rows=responses[:ANALYTICS_MAX_INLINE_ROWS]
+    )
+
+class AnalyticsEmailError(Exception):
+    """An analytics email could not be built or sent; the message says why"""
+
+def _deliver_analytics_email(aispot_data: Dict, start_date: Optional[datetime], end_date: Optional[datetime], responses: Optional[List[Dict]], date_range_text: Optional[str]):
+    """
+    Build and send one analytics email (see send_analytics_email)
+    
+    Raises:
+        AnalyticsEmailError: With the reason the email was not sent
+    """
+    # Get email configuration
+    config = get_email_config()
+    
+    if not config['password']:
+        raise AnalyticsEmailError("SMTP password not configured")
+    
+    recipient_email = aispot_data.get('email', '')
+    manager_email = aispot_data.get('manager_email', '')  # CC
     
-    name = aispot_data.get('name', '')
-    manager_name = aispot_data.get('owner_manager_name', '')
-    count = len(responses)
-    
-    # Determine message based on count
-    if count <= 5:
-        performance_message = """
-        <div style="background: #fff4e6; padding: 20px; border-left: 4px solid #ff9800; margin: 25px 0; border-radius: 5px;">
-            <p style="margin: 0; font-size: 15px; color: #e65100;">
-                <strong>⚠️ Quick Action Needed:</strong> You have not started to utilize the power of AI Spot yet. 
-                Believe me, this is super-powerful to help you make more money in your current business setup. 
-                <strong>You must take our support to train your team quickly on your tables.</strong> 
-                You'll be surprised to see how this small AI standee can increase your revenue very fast.
-            </p>
-        </div>
-        """
+    if not recipient_email:
+        raise AnalyticsEmailError(f"No email found for {aispot_data.get('name', '')}")
+    
+    # Stream quiz responses unless the caller already fetched them: the
+    # CSV writer consumes the pages and only the inline rows are kept
+    stream = None
+    csv_rows = responses
+    if responses is None:
+        stream = iter_quiz_responses(aispot_data.get('aispot_id', ''), start_date, end_date)
+        responses = []
+        csv_rows = _keep_rows(stream, responses, ANALYTICS_MAX_INLINE_ROWS)
+    
+    # Determine date range text (unless the caller already worded it)
+    if date_range_text is None:
+        date_range_text = describe_date_range(start_date, end_date)
+    
+    # Create CSV attachment (streamed, compressed above the configured size)
+    csv_filename = f"aispot_{aispot_data.get('name', '').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    try:
+        csv_attachment = _build_csv_attachment(csv_rows, aispot_data.get('name', ''), csv_filename)
+    except Exception as e:
+        raise AnalyticsEmailError(f"Failed to create CSV: {str(e)}") from e
+    
+    # Create email
+    msg = MIMEMultipart('mixed')
+    msg['From'] = config['email']
+    msg['To'] = recipient_email
+    
+    # Add CC if manager email exists
+    if manager_email and manager_email != recipient_email:
+        msg['Cc'] = manager_email
+    
+    msg['Bcc'] = config['bcc']
+    msg['Subject'] = f"AI Spot, {aispot_data.get('name', '')}, Your customer data and analytics for {date_range_text}"
+    
+    # Create HTML body
+    if stream is None:
+        total = len(responses)
     else:
-        performance_message = """
-        <div style="background: #e8f5e9; padding: 20px; border-left: 4px solid #4caf50; margin: 25px 0; border-radius: 5px;">
-            <p style="margin: 0; font-size: 15px; color: #2e7d32;">
-                <strong>✅ Great Progress!</strong> You are doing well, and gradually getting stronger grip on your customer base. 
-                You must use our analytics email everyday, run campaigns, make a full-blown reachout. 
-                <strong>Do not worry</strong>, we have taken their consent so that you can contact them on their phones/emails provided by them.
-            </p>
-        </div>
-        """
-    
-    # Create data table HTML
-    table_rows = ""
-    for resp in responses:
-        table_rows += f"""
-        <tr style="border-bottom: 1px solid #e0e0e0;">
-            <td style="padding: 12px; font-size: 14px;">{resp.get('name', '')}</td>
-            <td style="padding: 12px; font-size: 14px;">{resp.get('email', '')}</td>
-            <td style="padding: 12px; font-size: 14px;">{resp.get('mobile', '')}</td>
-            <td style="padding: 12px; font-size: 14px; text-align: center;"><strong>{resp.get('score', '')}</strong></td>
-            <td style="padding: 12px; font-size: 14px; text-align: center;">{resp.get('age', '')}</td>
-            <td style="padding: 12px; font-size: 14px;">{resp.get('occupation', '')}</td>
-            <td style="padding: 12px; font-size: 13px; color: #666;">{resp.get('created_at', '')[:19] if resp.get('created_at') else ''}</td>
-        </tr>
-        """
-    
-    html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI Spot Analytics - {name}</title>
-</head>
-<body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; margin: 0; padding: 20px; background: #f5f5f5;">
-    
-    <!-- Main Container -->
-    <div style="max-width: 900px; margin: 0 auto; background: white; border-radius: 10px; overflow: hidden; box-shadow: 0 2px 10px rgba(0,0,0,0.1);">
-        
-        <!-- Header -->
-        <div style="background: linear-gradient(135deg, #0055aa 0%, #003366 100%); padding: 40px 30px; text-align: center;">
-            <h1 style="color: white; margin: 0 0 10px 0; font-size: 28px;">🎯 AI Spot Analytics</h1>
-            <p style="color: #a3d9ff; margin: 0; font-size: 16px;">{name}</p>
-        </div>
-        
-        <!-- Hero Section -->
-        <div style="padding: 40px 30px; background: #f8f9fa;">
-            <h2 style="color: #0055aa; margin: 0 0 20px 0; font-size: 24px;">Dear {manager_name},</h2>
-            
-            <div style="background: linear-gradient(135deg, #e3f2fd 0%, #bbdefb 100%); padding: 25px; border-radius: 8px; border-left: 5px solid #0055aa;">
-                <p style="margin: 0; font-size: 18px; line-height: 1.6;">
-                    <strong style="color: #0055aa; font-size: 20px;">{count}</strong> of your guests submitted the Quiz <strong>{date_range_text}</strong>! 🎉
-                </p>
-            </div>
-            
-            <p style="font-size: 16px; margin: 25px 0; line-height: 1.8;">
-                This data is a <strong style="color: #0055aa;">gold mine</strong> 💎. We have received their consent so that you can 
-                <strong>reach out to each of them to make them visit you again</strong>.
-            </p>
-            
-            <p style="font-size: 16px; margin: 25px 0; line-height: 1.8;">
-                Let us know, in case you want to run further analytics on your data, or in case you want our help to run 
-                <strong>streamlined marketing campaigns to bring them back</strong>. We'll be glad to help you 
-                <strong style="color: #4caf50;">increase your revenue this way, faster</strong>. 💰
-            </p>
-        </div>
-        
-        <!-- Performance Message -->
-        <div style="padding: 0 30px;">
-            {performance_message}
-        </div>
-        
-        <!-- Data Grid -->
-        <div style="padding: 30px;">
-            <h3 style="color: #0055aa; margin: 0 0 20px 0; font-size: 20px;">📊 Customer Data</h3>
-            
-            <div style="overflow-x: auto;">
-                <table style="width: 100%; border-collapse: collapse; background: white; border: 1px solid #e0e0e0; border-radius: 8px; overflow: hidden;">
-                    <thead>
-                        <tr style="background: #0055aa; color: white;">
-                            <th style="padding: 15px 12px; text-align: left; font-size: 14px;">Name</th>
-                            <th style="padding: 15px 12px; text-align: left; font-size: 14px;">Email</th>
-                            <th style="padding: 15px 12px; text-align: left; font-size: 14px;">Mobile</th>
-                            <th style="padding: 15px 12px; text-align: center; font-size: 14px;">Score</th>
-                            <th style="padding: 15px 12px; text-align: center; font-size: 14px;">Age</th>
-                            <th style="padding: 15px 12px; text-align: left; font-size: 14px;">Occupation</th>
-                            <th style="padding: 15px 12px; text-align: left; font-size: 14px;">Created At</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {table_rows}
-                    </tbody>
-                </table>
-            </div>
-        </div>
-        
-        <!-- Additional Benefits -->
-        <div style="padding: 30px; background: #f8f9fa;">
-            <div style="background: #e8f5e9; padding: 20px; border-left: 4px solid #4caf50; border-radius: 5px;">
-                <h3 style="color: #2e7d32; margin: 0 0 10px 0; font-size: 18px;">💰 Bonus Revenue Opportunity</h3>
-                <p style="margin: 0; font-size: 15px; color: #2e7d32;">
-                    Additionally, if anyone from your AI Spot data enrols in our paid course, 
-                    <strong>we'll pay you 10%</strong> to make it sweeter! 🎁
-                </p>
-            </div>
-        </div>
-        
-        <!-- Closing -->
-        <div style="padding: 30px; text-align: center; background: #ffffff;">
-            <p style="font-size: 16px; margin: 0 0 10px 0; color: #0055aa;">
-                <strong>📧 Wait for my next email with the data and analytics of your AI Spot, again tomorrow.</strong>
-            </p>
-            <p style="font-size: 16px; margin: 0; color: #666;">
-                Same time. See you!!! 👋
-            </p>
-        </div>
-        
-        <!-- Footer -->
-        <div style="padding: 30px; background: #003366; text-align: center;">
-            <p style="color: #a3d9ff; margin: 0 0 10px 0; font-size: 14px;">
-                Questions? Contact us at: <a href="mailto:star.analytix.ai@gmail.com" style="color: #66ccff; text-decoration: none;">star.analytix.ai@gmail.com</a>
-            </p>
-            <p style="color: #a3d9ff; margin: 0; font-size: 14px;">
-                <strong>AI with Arijit Team</strong><br>
-                <a href="https://www.AIwithArijit.com" style="color: #66ccff; text-decoration: none;">www.AIwithArijit.com</a>
-            </p>
-        </div>
-        
-    </div>
+        total = stream.total if stream.total is not None else stream.fetched
+    html_body = create_analytics_email_html(aispot_data, responses, date_range_text, total=total)
+    msg.attach(MIMEText(html_body, 'html'))
     
-</body>
-</html>
-"""
+    # Attach CSV
+    msg.attach(csv_attachment)
     
-    return html
+    # Send email over a pooled, already-authenticated connection
+    try:
+        send_email_message(config, msg)
+    except Exception as e:
+        raise AnalyticsEmailError(f"SMTP send failed: {str(e)}") from e
 
-def send_analytics_email(aispot_data: Dict, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> bool:
+def send_analytics_email(aispot_data: Dict, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, responses: Optional[List[Dict]] = None, date_range_text: Optional[str] = None) -> bool:
     """
     Send analytics email to AI Spot owner
     
@@ -313,112 +487,128 @@ def send_analytics_email(aispot_data: Dict, start_date: Optional[datetime] = Non
         aispot_data: AI Spot record
         start_date: Start date (None for last 24 hours)
         end_date: End date (None for now)
+        responses: Pre-fetched quiz responses (None to fetch them here)
+        date_range_text: Wording of the window in the email (None to derive it from the dates)
     
     Returns:
         bool: Success status
     """
     try:
-        # Get email configuration
-        config = get_email_config()
-        
-        if not config['password']:
-            st.error("❌ SMTP password not configured.")
-            return False
-        
-        recipient_email = aispot_data.get('email', '')
-        manager_email = aispot_data.get('manager_email', '')  # CC
-        
-        if not recipient_email:
-            st.error(f"❌ No email found for {aispot_data.get('name', '')}")
-            return False
-        
-        # Fetch quiz responses
-        aispot_id = aispot_data.get('aispot_id', '')
-        responses = fetch_quiz_responses(aispot_id, start_date, end_date)
-        
-        # Determine date range text
-        if start_date is None:
-            date_range_text = "today (last 24 hours)"
-        else:
-            date_range_text = f"{start_date.strftime('%b %d')} - {end_date.strftime('%b %d, %Y')}"
-        
-        # Create CSV attachment
-        csv_data = create_csv_from_responses(responses, aispot_data.get('name', ''))
-        if not csv_data:
-            st.error("❌ Failed to create CSV")
-            return False
-        
-        # Create email
-        msg = MIMEMultipart('mixed')
-        msg['From'] = config['email']
-        msg['To'] = recipient_email
-        
-        # Add CC if manager email exists
-        if manager_email and manager_email != recipient_email:
-            msg['Cc'] = manager_email
-        
-        msg['Bcc'] = config['bcc']
-        msg['Subject'] = f"AI Spot, {aispot_data.get('name', '')}, Your customer data and analytics for {date_range_text}"
-        
-        # Create HTML body
-        html_body = create_analytics_email_html(aispot_data, responses, date_range_text)
-        msg.attach(MIMEText(html_body, 'html'))
-        
-        # Attach CSV
-        csv_filename = f"aispot_{aispot_data.get('name', '').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        csv_attachment = MIMEApplication(csv_data, _subtype='csv')
-        csv_attachment.add_header('Content-Disposition', 'attachment', filename=csv_filename)
-        msg.attach(csv_attachment)
-        
-        # Send email
-        if config['use_ssl']:
-            with smtplib.SMTP_SSL(config['host'], config['port']) as server:
-                server.login(config['email'], config['password'])
-                server.send_message(msg)
-        else:
-            with smtplib.SMTP(config['host'], config['port']) as server:
-                server.starttls()
-                server.login(config['email'], config['password'])
-                server.send_message(msg)
-        
+        _deliver_analytics_email(aispot_data, start_date, end_date, responses, date_range_text)
         return True
     
+    except AnalyticsEmailError as e:
+        show_error(f"❌ {str(e)}")
+        return False
+    
     except Exception as e:
-        st.error(f"❌ Error sending analytics email: {str(e)}")
+        show_error(f"❌ Error sending analytics email: {str(e)}")
         import traceback
-        st.error(f"Traceback: {traceback.format_exc()}")
+        show_error(f"Traceback: {traceback.format_exc()}")
         return False
 
-def send_bulk_analytics_emails(all_aispots: List[Dict], start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> Dict:
+def _keep_rows(responses: Iterable[Dict], kept: List[Dict], limit: int) -> Iterator[Dict]:
+    """Yield responses while appending the first limit of them to kept"""
+    for resp in responses:
+        if len(kept) < limit:
+            kept.append(resp)
+        yield resp
+
+def _send_one_analytics_email(aispot: Dict, start_date: Optional[datetime], end_date: Optional[datetime], responses: Optional[List[Dict]], date_range_text: Optional[str] = None) -> Dict:
+    """
+    Send one spot's analytics email and time it (safe to run on a worker thread)
+    
+    Returns:
+        Dict with aispot_id, name, success, seconds and error
+    """
+    started = time.perf_counter()
+    error = None
+    try:
+        _deliver_analytics_email(aispot, start_date, end_date, responses, date_range_text)
+        success = True
+    except AnalyticsEmailError as e:
+        success = False
+        error = str(e)
+    except Exception as e:
+        success = False
+        error = f"Error sending analytics email: {str(e)}"
+    
+    return {
+        'aispot_id': aispot.get('aispot_id', ''),
+        'name': aispot.get('name', ''),
+        'success': success,
+        'seconds': round(time.perf_counter() - started, 3),
+        'error': error
+    }
+
+def send_bulk_analytics_emails(all_aispots: List[Dict], start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, max_workers: Optional[int] = None, on_result: Optional[Callable[[Dict], None]] = None, date_range_text: Optional[str] = None) -> Dict:
     """
     Send analytics emails to all AI Spots
     
+    Spots are processed by a pool of max_workers threads; SMTP sends are
+    throttled by the shared provider rate limiter in utils.smtp_pool.
+    
     Args:
         all_aispots: List of all AI Spot records
         start_date: Start date
         end_date: End date
+        max_workers: Concurrent sends (None for ANALYTICS_EMAIL_WORKERS, 1 for serial)
+        on_result: Optional callback invoked with each spot's timing entry as it completes
+        date_range_text: Wording of the window in the emails (None to derive it from the dates)
     
     Returns:
-        Dict with success and failure counts
+        Dict with success and failure counts plus per-spot timings
     """
     results = {
         'success': 0,
         'failed': 0,
-        'failed_spots': []
+        'failed_spots': [],
+        'timings': []
     }
     
-    for aispot in all_aispots:
-        try:
-            success = send_analytics_email(aispot, start_date, end_date)
-            if success:
-                results['success'] += 1
-                st.success(f"✅ Sent to {aispot.get('name', '')}")
-            else:
-                results['failed'] += 1
-                results['failed_spots'].append(aispot.get('name', ''))
-        except Exception as e:
+    if max_workers is None:
+        max_workers = ANALYTICS_EMAIL_WORKERS
+    
+    # Fetch every spot's responses up front in a few queries; on failure each
+    # spot falls back to fetching its own
+    window_start, window_end = resolve_date_range(start_date, end_date)
+    grouped_responses = fetch_quiz_responses_bulk(
+        [aispot.get('aispot_id', '') for aispot in all_aispots],
+        window_start,
+        window_end
+    )
+    
+    def responses_for(aispot):
+        if grouped_responses is None:
+            return None
+        return grouped_responses.get(aispot.get('aispot_id', ''), [])
+    
+    def record(entry):
+        results['timings'].append(entry)
+        if entry['success']:
+            results['success'] += 1
+            show_success(f"✅ Sent to {entry['name']}")
+        else:
             results['failed'] += 1
-            results['failed_spots'].append(aispot.get('name', ''))
-            st.error(f"❌ Failed for {aispot.get('name', '')}: {str(e)}")
+            results['failed_spots'].append(entry['name'])
+            if entry['error']:
+                show_error(f"❌ Failed for {entry['name']}: {entry['error']}")
+        if on_result:
+            on_result(entry)
+    
+    if max_workers <= 1:
+        for aispot in all_aispots:
+            record(_send_one_analytics_email(aispot, start_date, end_date, responses_for(aispot), date_range_text))
+        return results
+    
+    # Workers have no Streamlit script context, so their messages go to the log;
+    # results are reported here on the calling thread as they complete
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analytics-email") as executor:
+        futures = [
+            executor.submit(_send_one_analytics_email, aispot, start_date, end_date, responses_for(aispot), date_range_text)
+            for aispot in all_aispots
+        ]
+        for future in as_completed(futures):
+            record(future.result())
     
     return results
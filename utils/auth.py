@@ -0,0 +1,137 @@
+"""
+Authentication utility module
+Loads pre-hashed admin credentials once per process for streamlit-authenticator
+
+Generate a password hash with:
+    python -m utils.auth <password>
+"""
+
+import os
+import sys
+import copy
+from typing import Dict, Tuple
+import bcrypt
+import streamlit as st
+import streamlit_authenticator as stauth
+from utils.config import get_secret, get_setting
+
+# Local credentials file (same layout as streamlit-authenticator's config.yaml):
+#   credentials:
+#     usernames:
+#       admin:
+#         name: Admin User
+#         password: $2b$12$...
+AUTH_CREDENTIALS_FILE = os.getenv("AUTH_CREDENTIALS_FILE", "credentials.yaml")
+
+AUTH_COOKIE_NAME = os.getenv("AUTH_COOKIE_NAME", "aispot_admin")
+AUTH_COOKIE_EXPIRY_DAYS = float(os.getenv("AUTH_COOKIE_EXPIRY_DAYS", "1"))
+
+# Demo account used when no credentials are configured (admin / arijitwith)
+DEFAULT_CREDENTIALS = {
+    'usernames': {
+        'admin': {
+            'name': 'Admin User',
+            'password': '$2b$12$bwBUHxt5A8ACZypT3Bsb8.BsFa9seRTy91/C/zx5lFxVrX9JOK1aS'
+        }
+    }
+}
+
+def hash_password(password: str) -> str:
+    """Bcrypt hash of a password, in the format stored in credentials"""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+def _normalize(credentials: Dict) -> Dict:
+    """
+    Copy credentials into plain dicts, hashing any plaintext passwords once
+
+    Args:
+        credentials: Mapping with a 'usernames' mapping
+
+    Returns:
+        dict: {'usernames': {username: {'name': ..., 'password': bcrypt hash, ...}}}
+    """
+    usernames = {}
+    for username, user in dict(credentials.get('usernames', {})).items():
+        user = dict(user)
+        password = str(user.get('password', ''))
+        if not password.startswith('$2'):
+            password = hash_password(password)
+        user['password'] = password
+        user.setdefault('name', username)
+        usernames[str(username)] = user
+
+    if not usernames:
+        raise ValueError("No users defined in credentials")
+    return {'usernames': usernames}
+
+def _secrets_credentials():
+    # get_secret only reads secrets.toml when it exists, so env-only
+    # deployments don't get Streamlit's "No secrets files found" error
+    return get_secret('credentials')
+
+def _file_credentials():
+    if not os.path.exists(AUTH_CREDENTIALS_FILE):
+        return None
+
+    import yaml
+
+    with open(AUTH_CREDENTIALS_FILE, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    return config.get('credentials', config)
+
+@st.cache_resource
+def load_credentials() -> Tuple[Dict, str]:
+    """
+    Load admin credentials (cached per process)
+
+    Sources, first match wins: the [credentials] table in Streamlit secrets,
+    AUTH_CREDENTIALS_FILE, then DEFAULT_CREDENTIALS.
+
+    Returns:
+        Tuple of (credentials, source) where source is 'secrets', 'file' or 'default'
+    """
+    for source, loader in (('secrets', _secrets_credentials), ('file', _file_credentials)):
+        try:
+            credentials = loader()
+            if credentials:
+                return _normalize(credentials), source
+        except Exception as e:
+            st.error(f"Error loading credentials from {source}: {str(e)}")
+
+    return _normalize(DEFAULT_CREDENTIALS), 'default'
+
+def get_cookie_key() -> str:
+    """Signing key for the re-login cookie (secrets, then environment)"""
+    return get_setting("AUTH_COOKIE_KEY", "aispot_admin_cookie_key_12345")
+
+def uses_default_credentials() -> bool:
+    """True when the built-in demo account is active"""
+    return load_credentials()[1] == 'default'
+
+def create_authenticator() -> stauth.Authenticate:
+    """
+    Build the authenticator for the current script run
+
+    Only the credentials are shared across runs. Authenticate itself has to
+    be created on every run because it renders the cookie manager component
+    and sets up session state; with pre-hashed passwords that is cheap, and
+    bcrypt only runs when a login form is submitted.
+
+    Returns:
+        stauth.Authenticate
+    """
+    credentials, _ = load_credentials()
+
+    # Authenticate lowercases usernames in place, so give it its own copy
+    return stauth.Authenticate(
+        copy.deepcopy(credentials),
+        AUTH_COOKIE_NAME,
+        get_cookie_key(),
+        cookie_expiry_days=AUTH_COOKIE_EXPIRY_DAYS
+    )
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python -m utils.auth <password>")
+        sys.exit(2)
+    print(hash_password(sys.argv[1]))
@@ -0,0 +1,148 @@
+"""
+Bulk Export utility module
+Renders standees for many AI Spots into a ZIP of PDFs or one multi-page PDF
+"""
+
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from utils.pdf_generator import generate_standee_pdf, generate_standee_pdfs, get_pdf_renderer, LocalRenderer
+from utils.pdf_writer import ImagePDFWriter, encode_jpeg_page
+from utils.standee_canvas import draw_standee_sheet
+
+# Concurrent renders during a bulk export
+STANDEE_EXPORT_WORKERS = int(os.getenv("STANDEE_EXPORT_WORKERS", "4"))
+
+# Jobs submitted together per round when exporting through CloudConvert
+STANDEE_EXPORT_BATCH_SIZE = int(os.getenv("STANDEE_EXPORT_BATCH_SIZE", "10"))
+
+# Locally drawn export pages use a lighter raster than single downloads
+# (~0.4 MB instead of ~1.3 MB per page) so exports of hundreds of spots
+# stay small enough to build and serve
+BULK_EXPORT_DPI = int(os.getenv("BULK_EXPORT_DPI", "200"))
+BULK_EXPORT_JPEG_QUALITY = int(os.getenv("BULK_EXPORT_JPEG_QUALITY", "80"))
+BULK_EXPORT_JPEG_SUBSAMPLING = 2  # 4:2:0
+
+def standee_filename(row_data: Dict) -> str:
+    """File name used for a spot's standee PDF (matches the per-row download)"""
+    name = str(row_data.get('name', '') or 'standee')
+    return f"standee_{name.replace(' ', '_')}_{str(row_data.get('aispot_id', ''))[:8]}.pdf"
+
+def _bounded_ordered_map(func: Callable, items: List, max_workers: int) -> Iterator[Tuple[object, object, Optional[Exception]]]:
+    """
+    Run func over items on a thread pool, yielding results in input order
+
+    At most 2 * max_workers results are pending at any time, so finished
+    output is consumed as it arrives instead of piling up in memory.
+
+    Yields:
+        Tuples of (item, result, exception)
+    """
+    window = max(1, max_workers) * 2
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="standee-export") as executor:
+        pending = deque()
+        remaining = iter(items)
+
+        for item in remaining:
+            pending.append((item, executor.submit(func, item)))
+            if len(pending) >= window:
+                break
+
+        while pending:
+            item, future = pending.popleft()
+            try:
+                yield item, future.result(), None
+            except Exception as e:
+                yield item, None, e
+
+            next_item = next(remaining, None)
+            if next_item is not None:
+                pending.append((next_item, executor.submit(func, next_item)))
+
+def _bulk_local_renderer() -> LocalRenderer:
+    return LocalRenderer(dpi=BULK_EXPORT_DPI, quality=BULK_EXPORT_JPEG_QUALITY, subsampling=BULK_EXPORT_JPEG_SUBSAMPLING)
+
+def _render_sheet_page(row_data: Dict):
+    sheet = draw_standee_sheet(row_data, dpi=BULK_EXPORT_DPI)
+    return encode_jpeg_page(sheet, BULK_EXPORT_JPEG_QUALITY, BULK_EXPORT_JPEG_SUBSAMPLING)
+
+def _iter_standee_pdfs(rows: List[Dict], max_workers: int) -> Iterator[Tuple[Dict, Optional[bytes], Optional[Exception]]]:
+    """
+    Yield (row, pdf_bytes, exception) in input order
+
+    Local renders run on the bounded thread pool; remote backends submit a
+    batch of jobs at a time and wait on them together.
+    """
+    renderer = get_pdf_renderer()
+    if renderer.name == LocalRenderer.name:
+        local = _bulk_local_renderer()
+        yield from _bounded_ordered_map(lambda row_data: generate_standee_pdf(row_data, local), rows, max_workers)
+        return
+
+    for start in range(0, len(rows), STANDEE_EXPORT_BATCH_SIZE):
+        batch = rows[start:start + STANDEE_EXPORT_BATCH_SIZE]
+        for row_data, pdf_bytes in zip(batch, generate_standee_pdfs(batch, renderer)):
+            yield row_data, pdf_bytes, None
+
+def export_standees(rows: Iterable[Dict], fileobj: BinaryIO, output_format: str = 'zip',
+                    max_workers: Optional[int] = None,
+                    progress_callback: Optional[Callable[[int, int, Dict], None]] = None) -> Dict:
+    """
+    Render standees for many AI Spots and stream them into one file
+
+    Args:
+        rows: AI Spot records (e.g. filtered_df.to_dict('records'))
+        fileobj: Writable binary file to stream the output into
+        output_format: 'zip' (one PDF per spot) or 'pdf' (one A4 page per spot)
+        max_workers: Concurrent renders (None for STANDEE_EXPORT_WORKERS)
+        progress_callback: Called as (done, total, row) after each spot is written
+
+    Returns:
+        Dict with exported and failed counts plus failed_spots
+    """
+    rows = list(rows)
+    total = len(rows)
+    results = {
+        'exported': 0,
+        'failed': 0,
+        'failed_spots': []
+    }
+
+    if max_workers is None:
+        max_workers = STANDEE_EXPORT_WORKERS
+
+    def record(done, row, ok):
+        if ok:
+            results['exported'] += 1
+        else:
+            results['failed'] += 1
+            results['failed_spots'].append(row.get('name', ''))
+        if progress_callback:
+            progress_callback(done, total, row)
+
+    if output_format == 'pdf':
+        # Multi-page PDFs are always drawn locally: pages are raster sheets
+        writer = ImagePDFWriter(fileobj)
+        for done, (row, page, error) in enumerate(_bounded_ordered_map(_render_sheet_page, rows, max_workers), 1):
+            if page:
+                writer.add_jpeg_page(*page)
+            record(done, row, page is not None)
+        writer.close()
+        return results
+
+    # PDFs are already compressed, so store them without deflating again
+    with zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_STORED) as archive:
+        used_names = set()
+        for done, (row, pdf_bytes, error) in enumerate(_iter_standee_pdfs(rows, max_workers), 1):
+            ok = bool(pdf_bytes) and pdf_bytes.startswith(b'%PDF')
+            if ok:
+                filename = standee_filename(row)
+                if filename in used_names:
+                    filename = filename[:-4] + f"_{done}.pdf"
+                used_names.add(filename)
+                archive.writestr(filename, pdf_bytes)
+            record(done, row, ok)
+
+    return results
@@ -0,0 +1,219 @@
+"""
+CloudConvert client utility module
+Keep-alive CloudConvert API client with inline HTML submission and adaptive polling
+"""
+
+import time
+import threading
+from typing import Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+CLOUDCONVERT_API_URL = "https://api.cloudconvert.com/v2"
+
+# Chrome engine settings for the 2x2 A4 standee sheet
+STANDEE_PDF_OPTIONS = {
+    "output_format": "pdf",
+    "engine": "chrome",
+    "page_width": 210,
+    "page_height": 297,
+    "margin_top": 8,
+    "margin_right": 9,
+    "margin_bottom": 8,
+    "margin_left": 9,
+    "print_background": True,
+    "display_header_footer": False
+}
+
+class CloudConvertError(Exception):
+    """A CloudConvert job could not be created, failed or timed out"""
+
+class CloudConvertJob:
+    """A submitted conversion job and its per-phase timings (seconds)"""
+
+    def __init__(self, job_id: str, submitted_at: float, submit_seconds: float):
+        self.id = job_id
+        self.submitted_at = submitted_at
+        self.timings = {'submit': submit_seconds}
+        self.polls = 0
+        self.download_url = None
+        self.result = None
+        self.error = None
+
+class CloudConvertClient:
+    """
+    CloudConvert API client
+
+    All requests share one keep-alive session. The HTML is embedded in the
+    job (import/raw) so there is no separate upload, and job status is
+    polled with a backoff that starts at poll_initial seconds and grows by
+    poll_factor up to poll_max.
+    """
+
+    def __init__(self, api_key: str, poll_initial: float = 0.25, poll_max: float = 2.0,
+                 poll_factor: float = 1.5, timeout: float = 60, pool_size: int = 10):
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.poll_factor = poll_factor
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {api_key}"})
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+
+    def submit_html(self, html_content: str, filename: str = "standee.html", options: Optional[Dict] = None) -> CloudConvertJob:
+        """
+        Create an HTML to PDF job with the HTML embedded in the request
+
+        Args:
+            html_content: HTML string
+            filename: Name given to the imported file
+            options: Convert task options (None for STANDEE_PDF_OPTIONS)
+
+        Returns:
+            CloudConvertJob
+
+        Raises:
+            CloudConvertError: If the job could not be created
+        """
+        convert_task = {"operation": "convert", "input": "import-html"}
+        convert_task.update(options or STANDEE_PDF_OPTIONS)
+
+        job_data = {
+            "tasks": {
+                "import-html": {
+                    "operation": "import/raw",
+                    "file": html_content,
+                    "filename": filename
+                },
+                "convert-to-pdf": convert_task,
+                "export-pdf": {
+                    "operation": "export/url",
+                    "input": "convert-to-pdf"
+                }
+            }
+        }
+
+        started = time.perf_counter()
+        response = self.session.post(f"{CLOUDCONVERT_API_URL}/jobs", json=job_data, timeout=30)
+        if response.status_code != 201:
+            error_msg = response.json() if response.text else response.text
+            raise CloudConvertError(f"CloudConvert job creation failed: {error_msg}")
+
+        return CloudConvertJob(response.json()['data']['id'], started, time.perf_counter() - started)
+
+    def _poll(self, job: CloudConvertJob) -> bool:
+        """Check a job once; returns True when it has finished or failed"""
+        job.polls += 1
+        try:
+            response = self.session.get(f"{CLOUDCONVERT_API_URL}/jobs/{job.id}", timeout=10)
+            if response.status_code != 200:
+                job.error = f"Job status check failed: {response.text}"
+                return True
+            data = response.json()['data']
+        except (requests.RequestException, ValueError, KeyError) as e:
+            # One job's failed check must not abort the rest of the batch
+            job.error = f"Job status check failed: {e}"
+            return True
+
+        status = data['status']
+
+        if status == 'finished':
+            export_task = next((task for task in data['tasks'] if task['name'] == 'export-pdf'), {})
+            files = (export_task.get('result') or {}).get('files') or []
+            if files:
+                job.download_url = files[0]['url']
+            else:
+                job.error = "No download URL found in export task"
+            return True
+
+        if status == 'error':
+            error_tasks = [t for t in data['tasks'] if t.get('status') == 'error']
+            job.error = f"CloudConvert job failed: {error_tasks[0].get('message', 'Unknown error') if error_tasks else 'Unknown error'}"
+            return True
+
+        return False
+
+    def _download(self, job: CloudConvertJob):
+        started = time.perf_counter()
+        try:
+            response = self.session.get(job.download_url, timeout=30)
+        except requests.RequestException as e:
+            job.error = f"PDF download failed: {e}"
+            return
+        finally:
+            job.timings['download'] = time.perf_counter() - started
+        if response.status_code == 200:
+            job.result = response.content
+        else:
+            job.error = f"PDF download failed: {response.text}"
+
+    def wait_many(self, jobs: List[CloudConvertJob], timeout: Optional[float] = None) -> List[CloudConvertJob]:
+        """
+        Wait for several jobs together and download their results
+
+        Every pending job is polled once per round; rounds back off
+        adaptively. Each job ends with either result (PDF bytes) or error set.
+
+        Args:
+            jobs: Jobs returned by submit_html
+            timeout: Overall wait limit in seconds (None for the client timeout)
+
+        Returns:
+            The same jobs, completed
+        """
+        deadline = time.perf_counter() + (timeout or self.timeout)
+        pending = list(jobs)
+        delay = self.poll_initial
+
+        while pending:
+            still_pending = []
+            for job in pending:
+                if self._poll(job):
+                    job.timings['convert'] = time.perf_counter() - job.submitted_at - job.timings['submit']
+                    if job.download_url and not job.error:
+                        self._download(job)
+                    job.timings['total'] = time.perf_counter() - job.submitted_at
+                else:
+                    still_pending.append(job)
+            pending = still_pending
+
+            if pending:
+                if time.perf_counter() + delay > deadline:
+                    for job in pending:
+                        job.error = "CloudConvert job timeout"
+                        job.timings['total'] = time.perf_counter() - job.submitted_at
+                    break
+                time.sleep(delay)
+                delay = min(self.poll_max, delay * self.poll_factor)
+
+        return jobs
+
+    def wait(self, job: CloudConvertJob, timeout: Optional[float] = None) -> bytes:
+        """
+        Wait for one job and return its PDF (timings stay on the job)
+
+        Raises:
+            CloudConvertError: If the job failed or timed out
+        """
+        self.wait_many([job], timeout)
+        if job.error:
+            raise CloudConvertError(job.error)
+        return job.result
+
+    def convert_html_to_pdf(self, html_content: str, filename: str = "standee.html") -> bytes:
+        """Submit one HTML document and wait for its PDF"""
+        return self.wait(self.submit_html(html_content, filename))
+
+_clients: Dict[str, CloudConvertClient] = {}
+_clients_lock = threading.Lock()
+
+def get_cloudconvert_client(api_key: str) -> CloudConvertClient:
+    """Get the shared client (and its keep-alive session) for an API key"""
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = CloudConvertClient(api_key)
+            _clients[api_key] = client
+        return client
@@ -0,0 +1,152 @@
+"""
+Data access utility module
+Process-wide Supabase client and shared query helpers for the app and headless scripts
+"""
+
+import threading
+from typing import Callable, Dict, Iterator, List, Optional
+from supabase import create_client, Client
+from utils.config import get_supabase_config
+from utils.ui_feedback import show_error
+
+AISPOT_TABLE = 'aispot_master'
+QUIZ_RESPONSES_TABLE = 'quiz_responses'
+
+# Rows per request (PostgREST default max)
+PAGE_SIZE = 1000
+
+# Max ids per in_() filter, keeping request URLs well under server limits
+ID_CHUNK_SIZE = 150
+
+_client: Optional[Client] = None
+_client_lock = threading.Lock()
+
+def get_supabase_client() -> Optional[Client]:
+    """
+    Get the shared Supabase client
+
+    One client per process: its PostgREST session (and the keep-alive
+    connections in it) is reused by every query and thread.
+
+    Returns:
+        Client, or None if it could not be created
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is None:
+            try:
+                config = get_supabase_config()
+                _client = create_client(config['url'], config['key'])
+            except Exception as e:
+                show_error(f"Failed to connect to Supabase: {str(e)}")
+                return None
+        return _client
+
+def iter_pages(build_query: Callable, page_size: int = PAGE_SIZE, count: Optional[str] = None) -> Iterator:
+    """
+    Run a paginated query, yielding one response per page
+    
+    With a count, pages are requested until that many rows have been read,
+    so a server max-rows below page_size cannot truncate the result.
+    Without one, a short page marks the end.
+    
+    Args:
+        build_query: Callable taking the count mode and returning a fresh, ordered query builder
+        page_size: Rows per request
+        count: PostgREST count mode for the first request (e.g. 'exact'), or None
+    
+    Yields:
+        Each page's response (records in .data, the count of the first page in .count)
+    """
+    offset = 0
+    total = None
+    while True:
+        response = build_query(count if offset == 0 else None).range(offset, offset + page_size - 1).execute()
+        page = response.data or []
+        if offset == 0 and count:
+            total = response.count
+        yield response
+        
+        offset += len(page)
+        if total is not None:
+            if not page or offset >= total:
+                return
+        elif len(page) < page_size:
+            return
+
+def fetch_all_pages(build_query: Callable, page_size: int = PAGE_SIZE, count: Optional[str] = 'exact') -> List[Dict]:
+    """
+    Run a paginated query and collect every page
+    
+    The first request asks for the row count (see iter_pages), so a server
+    max-rows below page_size does not cut the result short.
+    
+    Args:
+        build_query: Callable taking the count mode and returning a fresh, ordered query builder
+        page_size: Rows per request
+        count: PostgREST count mode for the first request (None for the short-page check only)
+    
+    Returns:
+        List of all records across pages
+    """
+    records = []
+    for response in iter_pages(build_query, page_size, count=count):
+        records.extend(response.data or [])
+    return records
+
+def fetch_aispot_records(aispot_ids: List[str], columns: str = '*') -> List[Dict]:
+    """
+    Fetch AI Spot records by id in batched in_() queries
+
+    Args:
+        aispot_ids: UUIDs of the AI Spots
+        columns: Columns to select
+
+    Returns:
+        list: Records in the order of aispot_ids (missing ids are skipped)
+
+    Raises:
+        ConnectionError: If no Supabase client is available
+    """
+    client = get_supabase_client()
+    if not client:
+        raise ConnectionError("Supabase client unavailable")
+
+    records = {}
+    for start in range(0, len(aispot_ids), ID_CHUNK_SIZE):
+        chunk = aispot_ids[start:start + ID_CHUNK_SIZE]
+        response = client.table(AISPOT_TABLE).select(columns).in_('aispot_id', chunk).execute()
+        for record in response.data or []:
+            records[record['aispot_id']] = record
+
+    return [records[aispot_id] for aispot_id in aispot_ids if aispot_id in records]
+
+def fetch_aispots(columns: str = '*', approved_only: bool = False) -> List[Dict]:
+    """
+    Fetch every AI Spot, newest first, page by page
+
+    Args:
+        columns: Columns to select
+        approved_only: Only approved AI Spots
+
+    Returns:
+        list: AI Spot records
+
+    Raises:
+        ConnectionError: If no Supabase client is available
+    """
+    client = get_supabase_client()
+    if not client:
+        raise ConnectionError("Supabase client unavailable")
+
+    def build_query(count=None):
+        query = client.table(AISPOT_TABLE).select(columns, count=count)
+        if approved_only:
+            query = query.eq('is_approved', True)
+        # aispot_id breaks created_at ties, so offset pages never overlap or skip rows
+        return query.order('created_at', desc=True).order('aispot_id')
+
+    return fetch_all_pages(build_query)
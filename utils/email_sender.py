@@ -3,39 +3,19 @@ Email Sender utility module
 Sends standee HTML directly as email body (single standee with print button)
 """
 
-import os
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from email.mime.image import MIMEImage
 from typing import Dict, Optional
 import streamlit as st
-from utils.pdf_generator import generate_preview_html
+from utils.qr_code import qr_code_png
+from utils.template_renderer import render_standee_html
+from utils.smtp_pool import send_email_message
+from utils.config import get_email_config
 
-def get_email_config():
-    """Get email configuration from Streamlit secrets or environment variables"""
-    try:
-        # Try Streamlit secrets first (for Streamlit Cloud)
-        if hasattr(st, 'secrets') and 'SMTP_HOST' in st.secrets:
-            return {
-                'host': st.secrets['SMTP_HOST'],
-                'port': int(st.secrets['SMTP_PORT']),
-                'use_ssl': st.secrets.get('SMTP_USE_SSL', True),
-                'email': st.secrets['SMTP_EMAIL'],
-                'password': st.secrets['SMTP_PASSWORD'],
-                'bcc': st.secrets['SMTP_BCC']
-            }
-    except:
-        pass
-    
-    # Fallback to environment variables (for local development)
-    return {
-        'host': os.getenv("SMTP_HOST", "smtpout.secureserver.net"),
-        'port': int(os.getenv("SMTP_PORT", "465")),
-        'use_ssl': os.getenv("SMTP_USE_SSL", "True").lower() == "true",
-        'email': os.getenv("SMTP_EMAIL", "ai@withArijit.com"),
-        'password': os.getenv("SMTP_PASSWORD", ""),
-        'bcc': os.getenv("SMTP_BCC", "star.analytix.ai@gmail.com")
-    }
+# Content-ID of the inline QR image referenced by the standee HTML
+QR_CONTENT_ID = "aispot-qr"
 
 def send_standee_email(row_data: Dict) -> bool:
     """
@@ -61,8 +41,10 @@ def send_standee_email(row_data: Dict) -> bool:
             st.error("❌ No recipient email found in record.")
             return False
         
-        # Generate the standee HTML (exactly as "View HTML" shows)
-        html_body = generate_preview_html(row_data)
+        # Generate the standee HTML (exactly as "View HTML" shows). Most mail
+        # clients block data: URIs, so the QR goes in as an inline CID image.
+        qr_png = qr_code_png(row_data.get('qr_code_link', '') or '')
+        html_body = render_standee_html(row_data, qr_image_src=f"cid:{QR_CONTENT_ID}")
         
         if not html_body:
             st.error("❌ Failed to generate HTML for email.")
@@ -105,20 +87,16 @@ www.AIwithArijit.com
         
         # Attach both versions
         msg.attach(MIMEText(text_body, 'plain'))
-        msg.attach(MIMEText(html_body, 'html'))
+        html_part = MIMEMultipart('related')
+        html_part.attach(MIMEText(html_body, 'html'))
+        qr_image = MIMEImage(qr_png, _subtype='png')
+        qr_image.add_header('Content-ID', f"<{QR_CONTENT_ID}>")
+        qr_image.add_header('Content-Disposition', 'inline', filename='aispot_qr.png')
+        html_part.attach(qr_image)
+        msg.attach(html_part)
         
-        # Send email
-        if config['use_ssl']:
-            # Use SSL (port 465)
-            with smtplib.SMTP_SSL(config['host'], config['port']) as server:
-                server.login(config['email'], config['password'])
-                server.send_message(msg)
-        else:
-            # Use TLS (port 587)
-            with smtplib.SMTP(config['host'], config['port']) as server:
-                server.starttls()
-                server.login(config['email'], config['password'])
-                server.send_message(msg)
+        # Send email over a pooled, already-authenticated connection
+        send_email_message(config, msg)
         
         return True
     
@@ -0,0 +1,299 @@
+"""
+Job Queue utility module
+Persistent background jobs (SQLite) for bulk operations, run outside the Streamlit script thread
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import closing
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from utils.config import CACHE_DIR
+
+logger = logging.getLogger("aispot.jobs")
+
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join(CACHE_DIR, 'jobs.sqlite3'))
+
+# How long the idle worker waits between checks for new jobs
+JOB_POLL_SECONDS = 2.0
+
+JOB_BULK_ANALYTICS_EMAIL = 'bulk_analytics_email'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    params TEXT NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0,
+    success INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id INTEGER NOT NULL REFERENCES jobs(id),
+    aispot_id TEXT NOT NULL,
+    name TEXT,
+    success INTEGER NOT NULL,
+    seconds REAL,
+    error TEXT,
+    finished_at REAL NOT NULL,
+    PRIMARY KEY (job_id, aispot_id)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+# Job kind -> handler(queue, job); registered with @job_handler
+JOB_HANDLERS: Dict[str, Callable[['JobQueue', Dict], None]] = {}
+
+def job_handler(kind: str):
+    """Register the function that runs jobs of the given kind"""
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return register
+
+class JobQueue:
+    """
+    SQLite-backed job queue with a single worker thread
+
+    Jobs and their per-item outcomes are stored in JOB_DB_PATH, so progress
+    survives page reloads and can be polled from any session. Jobs that
+    were running when the process stopped are queued again on start-up,
+    and handlers skip the items already recorded for them.
+    """
+
+    def __init__(self, path: str = JOB_DB_PATH):
+        self.path = path
+        self._wakeup = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            conn.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps this safe across threads;
+        # callers close it with closing() (and commit with "with conn")
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _job_dict(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job['params'] = json.loads(job['params'])
+        return job
+
+    def enqueue(self, kind: str, params: Dict, total: int = 0) -> int:
+        """
+        Add a job and wake the worker
+
+        Args:
+            kind: Registered job kind
+            params: JSON-serializable job parameters
+            total: Number of items the job will process
+
+        Returns:
+            int: Job id
+        """
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (kind, params, total, created_at) VALUES (?, ?, ?, ?)",
+                (kind, json.dumps(params), total, time.time())
+            )
+            job_id = cursor.lastrowid
+
+        self.start_worker()
+        self._wakeup.set()
+        return job_id
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        """Get a job by id"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._job_dict(row) if row else None
+
+    def list_jobs(self, limit: int = 10) -> List[Dict]:
+        """Get the most recent jobs, newest first"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+            return [self._job_dict(row) for row in rows]
+
+    def job_items(self, job_id: int) -> List[Dict]:
+        """Get a job's per-item outcomes in completion order"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT aispot_id, name, success, seconds, error, finished_at FROM job_items "
+                "WHERE job_id = ? ORDER BY finished_at",
+                (job_id,)
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+    def completed_ids(self, job_id: int) -> set:
+        """Ids of the items a job has already processed"""
+        return {item['aispot_id'] for item in self.job_items(job_id)}
+
+    def record_item(self, job_id: int, entry: Dict):
+        """
+        Store one item's outcome and update the job's counters
+
+        Args:
+            job_id: Job id
+            entry: Dict with aispot_id, name, success, seconds and error
+        """
+        success = 1 if entry.get('success') else 0
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO job_items (job_id, aispot_id, name, success, seconds, error, finished_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, entry.get('aispot_id', ''), entry.get('name', ''), success,
+                 entry.get('seconds'), entry.get('error'), time.time())
+            )
+            if cursor.rowcount:
+                conn.execute(
+                    "UPDATE jobs SET done = done + 1, success = success + ?, failed = failed + ? WHERE id = ?",
+                    (success, 1 - success, job_id)
+                )
+
+    def _claim_next(self) -> Optional[Dict]:
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = COALESCE(started_at, ?) WHERE id = ?",
+                (time.time(), row['id'])
+            )
+        return self.get_job(row['id'])
+
+    def _finish(self, job_id: int, status: str, error: Optional[str] = None):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, error, time.time(), job_id)
+            )
+
+    def _run(self, job: Dict):
+        handler = JOB_HANDLERS.get(job['kind'])
+        if handler is None:
+            self._finish(job['id'], 'failed', f"Unknown job kind: {job['kind']}")
+            return
+
+        logger.info("Job %s (%s) started", job['id'], job['kind'])
+        try:
+            handler(self, job)
+            self._finish(job['id'], 'done')
+            logger.info("Job %s finished", job['id'])
+        except Exception as e:
+            self._finish(job['id'], 'failed', str(e))
+            logger.exception("Job %s failed", job['id'])
+
+    def _work(self):
+        while True:
+            job = self._claim_next()
+            if job is None:
+                self._wakeup.wait(JOB_POLL_SECONDS)
+                self._wakeup.clear()
+                continue
+            self._run(job)
+
+    def start_worker(self):
+        """Start the worker thread if it is not already running"""
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name="aispot-job-worker", daemon=True)
+                self._worker.start()
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    """Get the process-wide job queue and make sure its worker is running"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        _queue.start_worker()
+        return _queue
+
+def job_throughput(job: Dict) -> Optional[float]:
+    """Items processed per minute so far, or None before the job starts"""
+    if not job.get('started_at') or not job.get('done'):
+        return None
+    elapsed = (job.get('finished_at') or time.time()) - job['started_at']
+    return job['done'] / elapsed * 60 if elapsed > 0 else None
+
+def enqueue_bulk_analytics(aispot_ids: List[str], start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> int:
+    """
+    Queue analytics emails for many AI Spots
+
+    The date window is resolved now, so a job resumed after a restart
+    still covers the same period; a default window is remembered so the
+    emails still describe it as today.
+
+    Args:
+        aispot_ids: AI Spot IDs
+        start_date: Start date (None for last 24 hours)
+        end_date: End date (None for now)
+
+    Returns:
+        int: Job id
+    """
+    from utils.analytics_email import resolve_date_range
+
+    default_window = start_date is None and end_date is None
+    start_date, end_date = resolve_date_range(start_date, end_date)
+    params = {
+        'aispot_ids': list(aispot_ids),
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'default_window': default_window
+    }
+    return get_job_queue().enqueue(JOB_BULK_ANALYTICS_EMAIL, params, total=len(params['aispot_ids']))
+
+@job_handler(JOB_BULK_ANALYTICS_EMAIL)
+def run_bulk_analytics_job(queue: JobQueue, job: Dict):
+    """Send the analytics emails of a queued bulk job, skipping spots already done"""
+    from utils.analytics_email import DEFAULT_DATE_RANGE_TEXT, send_bulk_analytics_emails
+    from utils.data_access import fetch_aispot_records
+
+    params = job['params']
+    done = queue.completed_ids(job['id'])
+    pending = [aispot_id for aispot_id in params['aispot_ids'] if aispot_id not in done]
+    if not pending:
+        return
+
+    records = fetch_aispot_records(pending)
+
+    found = {record['aispot_id'] for record in records}
+    for aispot_id in pending:
+        if aispot_id not in found:
+            queue.record_item(job['id'], {
+                'aispot_id': aispot_id,
+                'name': '',
+                'success': False,
+                'seconds': 0,
+                'error': "AI Spot not found"
+            })
+
+    send_bulk_analytics_emails(
+        records,
+        datetime.fromisoformat(params['start_date']),
+        datetime.fromisoformat(params['end_date']),
+        on_result=lambda entry: queue.record_item(job['id'], entry),
+        date_range_text=DEFAULT_DATE_RANGE_TEXT if params.get('default_window') else None
+    )
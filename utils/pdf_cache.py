@@ -0,0 +1,117 @@
+"""
+PDF Cache utility module
+Content-addressed, size-bounded LRU cache of rendered standee PDFs on disk
+"""
+
+import os
+import hashlib
+import tempfile
+import threading
+from typing import Dict, Optional, Sequence
+from utils.config import CACHE_DIR
+from utils.template_renderer import get_standee_template, standee_fields
+
+PDF_CACHE_DIR = os.path.join(CACHE_DIR, 'pdf')
+
+# Total size budget for cached PDFs
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+class PDFCache:
+    """
+    Disk-backed LRU cache of finished PDFs
+
+    Entries are files named by their key. A hit refreshes the file's mtime,
+    and writes evict the least recently used files once the directory
+    exceeds max_bytes.
+    """
+
+    def __init__(self, directory: str = PDF_CACHE_DIR, max_bytes: int = PDF_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached PDF for key, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store a PDF and evict old entries beyond the size budget"""
+        if self.max_bytes <= 0 or len(data) > self.max_bytes:
+            return
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            return  # Read-only filesystem: caching is best-effort
+
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            try:
+                with os.scandir(self.directory) as scan:
+                    for entry in scan:
+                        if entry.name.endswith('.pdf'):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime, stat.st_size, entry.path))
+                            total += stat.st_size
+            except OSError:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+_pdf_cache = PDFCache()
+
+def get_pdf_cache() -> PDFCache:
+    """Get the shared standee PDF cache"""
+    return _pdf_cache
+
+def standee_pdf_cache_key(row_data: Dict, renderer_name: str, renderer_settings: Sequence = ()) -> str:
+    """
+    Cache key for a standee PDF
+
+    Hashes the rendered fields (name, type_of_place, owner_manager_name,
+    aispot_id, qr_code_link), the template version, the backend and its
+    output settings, so any edit to the record, the template or the
+    renderer misses the cache.
+
+    Args:
+        row_data: Dictionary (or pandas row) containing AI Spot data
+        renderer_name: Name of the rendering backend
+        renderer_settings: Backend settings that change its output (e.g. DPI, layout version)
+
+    Returns:
+        str: Hex digest
+    """
+    parts = [renderer_name, get_standee_template().version]
+    parts.extend(str(setting) for setting in renderer_settings)
+    parts.extend(standee_fields(row_data, qr_image_src=''))
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
@@ -1,238 +1,246 @@
 """
 PDF Generator utility module
-Generates table standee PDFs using CloudConvert API
+Generates table standee PDFs using CloudConvert API or a local Pillow renderer
 Creates 2x2 layout (4 standees per A4 page)
 """
 
 import os
+import logging
 import requests
-import time
-from typing import Optional, Dict
-import streamlit as st
-from io import BytesIO
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, List
+from utils.template_renderer import render_standee_html
+from utils.standee_canvas import STANDEE_LAYOUT_VERSION, STANDEE_SHEET_DPI, draw_standee_sheet
+from utils.pdf_writer import images_to_pdf_bytes
+from utils.pdf_cache import get_pdf_cache, standee_pdf_cache_key
+from utils.ui_feedback import show_error, show_warning
+from utils.cloudconvert_client import CloudConvertError, get_cloudconvert_client
+
+logger = logging.getLogger("aispot")
 
 # CloudConvert API configuration
 CLOUDCONVERT_API_KEY = os.getenv("CLOUDCONVERT_API_KEY", "")
 
-def generate_standee_pdf(row_data: Dict) -> Optional[bytes]:
-    """
-    Generate PDF with 2x2 layout using CloudConvert API
+# Rendering backend: "auto" (CloudConvert when a key is set, else local), "cloudconvert" or "local"
+PDF_RENDERER = os.getenv("PDF_RENDERER", "auto")
+
+class StandeePDFRenderer(ABC):
+    """Backend that renders an AI Spot record to the 2x2 A4 standee PDF"""
     
-    Args:
-        row_data: Dictionary containing AI Spot data
+    name = ""
     
-    Returns:
-        bytes: PDF file as bytes or None if failed
-    """
-    try:
-        # Check if API key is configured
-        if not CLOUDCONVERT_API_KEY:
-            st.warning("⚠️ CloudConvert API key not configured. Downloading HTML file instead.")
-            return generate_standee_html_fallback(row_data)
+    def cache_settings(self) -> tuple:
+        """Settings that change the rendered output (part of the PDF cache key)"""
+        return ()
+    
+    @abstractmethod
+    def render(self, row_data: Dict) -> Optional[bytes]:
+        """
+        Render the standee PDF
         
-        # Load the standee template
-        template_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'tablestandee.html')
+        Args:
+            row_data: Dictionary containing AI Spot data
         
-        with open(template_path, 'r', encoding='utf-8') as f:
-            html_template = f.read()
+        Returns:
+            bytes: PDF file as bytes or None if failed
+        """
+    
+    def render_many(self, rows: List[Dict]) -> List[Optional[bytes]]:
+        """
+        Render several standee PDFs (backends may batch this)
         
-        # Replace placeholders with actual data
-        html_content = html_template.replace('{{name}}', row_data.get('name', ''))
-        html_content = html_content.replace('{{type_of_place}}', row_data.get('type_of_place', ''))
-        html_content = html_content.replace('{{manager_name}}', row_data.get('owner_manager_name', ''))
-        html_content = html_content.replace('{{aispot_id}}', row_data.get('aispot_id', '')[:8])
-        html_content = html_content.replace('{{qr_code_link}}', row_data.get('qr_code_link', ''))
+        Args:
+            rows: AI Spot records
         
-        # Remove download section for PDF
-        html_content = html_content.replace('<div class="download-section">', '<div class="download-section" style="display: none;">')
+        Returns:
+            List of PDF bytes (None for failures), in input order
+        """
+        return [self.render(row_data) for row_data in rows]
+
+class CloudConvertRenderer(StandeePDFRenderer):
+    """Renders the HTML template with headless Chrome on CloudConvert"""
+    
+    name = "cloudconvert"
+    
+    def _grid_html(self, row_data: Dict) -> str:
+        # Render the standee without its download section
+        html_content = render_standee_html(row_data, hide_download=True)
         
         # Create 2x2 grid
-        grid_html = create_2x2_grid_html(html_content)
-        
-        # Convert HTML to PDF using CloudConvert API
-        pdf_bytes = convert_html_to_pdf_cloudconvert(grid_html, row_data.get('name', 'standee'))
-        
-        if pdf_bytes:
-            return pdf_bytes
-        else:
-            st.warning("CloudConvert conversion failed. Downloading HTML file instead.")
-            return generate_standee_html_fallback(row_data)
+        return create_2x2_grid_html(html_content)
     
-    except Exception as e:
-        st.error(f"Error generating PDF: {str(e)}")
-        return generate_standee_html_fallback(row_data)
+    def render(self, row_data: Dict) -> Optional[bytes]:
+        return convert_html_to_pdf_cloudconvert(self._grid_html(row_data), row_data.get('name', 'standee'))
+    
+    def render_many(self, rows: List[Dict]) -> List[Optional[bytes]]:
+        # Submit every job first, then wait on all of them together
+        client = get_cloudconvert_client(CLOUDCONVERT_API_KEY)
+        jobs = []
+        for row_data in rows:
+            try:
+                jobs.append(client.submit_html(self._grid_html(row_data)))
+            except (CloudConvertError, requests.RequestException) as e:
+                show_error(f"CloudConvert submit failed for {row_data.get('name', '')}: {str(e)}")
+                jobs.append(None)
+        
+        client.wait_many([job for job in jobs if job])
+        
+        results = []
+        for row_data, job in zip(rows, jobs):
+            if job and job.error:
+                show_error(f"{job.error} ({row_data.get('name', '')})")
+            results.append(job.result if job and not job.error else None)
+        return results
 
-def convert_html_to_pdf_cloudconvert(html_content: str, filename_prefix: str = "standee") -> Optional[bytes]:
+class LocalRenderer(StandeePDFRenderer):
+    """Draws the 2x2 sheet in-process with Pillow and writes a one-page PDF"""
+    
+    name = "local"
+    
+    def __init__(self, dpi: int = STANDEE_SHEET_DPI, quality: int = 90, subsampling: int = 0):
+        """
+        Args:
+            dpi: Sheet resolution
+            quality: JPEG quality of the page image
+            subsampling: JPEG chroma subsampling (0 = 4:4:4, 2 = 4:2:0)
+        """
+        self.dpi = dpi
+        self.quality = quality
+        self.subsampling = subsampling
+    
+    def cache_settings(self) -> tuple:
+        return (self.dpi, self.quality, self.subsampling, STANDEE_LAYOUT_VERSION)
+    
+    def render(self, row_data: Dict) -> Optional[bytes]:
+        sheet = draw_standee_sheet(row_data, dpi=self.dpi)
+        return images_to_pdf_bytes([sheet], quality=self.quality, subsampling=self.subsampling)
+
+PDF_RENDERERS = {
+    CloudConvertRenderer.name: CloudConvertRenderer,
+    LocalRenderer.name: LocalRenderer
+}
+
+def get_pdf_renderer(name: Optional[str] = None) -> StandeePDFRenderer:
     """
-    Convert HTML to PDF using CloudConvert API with upload method
+    Get the configured PDF rendering backend
     
     Args:
-        html_content: HTML string
-        filename_prefix: Prefix for the filename
+        name: "cloudconvert", "local" or "auto" (None for PDF_RENDERER)
     
     Returns:
-        bytes: PDF content or None if failed
+        StandeePDFRenderer instance
+    """
+    name = (name or PDF_RENDERER).lower()
+    
+    if name == "auto":
+        name = CloudConvertRenderer.name if CLOUDCONVERT_API_KEY else LocalRenderer.name
+    
+    if name not in PDF_RENDERERS:
+        show_warning(f"⚠️ Unknown PDF renderer '{name}'. Rendering locally instead.")
+        name = LocalRenderer.name
+    
+    return PDF_RENDERERS[name]()
+
+def generate_standee_pdfs(rows: List[Dict], renderer: Optional[StandeePDFRenderer] = None) -> List[Optional[bytes]]:
+    """
+    Generate 2x2 standee PDFs for several AI Spots
+    
+    Cached PDFs are served from disk; the misses are rendered as one batch
+    (a single round of CloudConvert jobs when that backend is active).
+    
+    Args:
+        rows: AI Spot records
+        renderer: Backend to use (None for get_pdf_renderer())
+    
+    Returns:
+        List of PDF bytes (None for failures), in input order
     """
     try:
-        headers = {
-            "Authorization": f"Bearer {CLOUDCONVERT_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        # Step 1: Create a job using import/upload
-        job_data = {
-            "tasks": {
-                "upload-html": {
-                    "operation": "import/upload"
-                },
-                "convert-to-pdf": {
-                    "operation": "convert",
-                    "input": "upload-html",
-                    "output_format": "pdf",
-                    "engine": "chrome",
-                    "page_width": 210,
-                    "page_height": 297,
-                    "margin_top": 8,
-                    "margin_right": 9,
-                    "margin_bottom": 8,
-                    "margin_left": 9,
-                    "print_background": True,
-                    "display_header_footer": False
-                },
-                "export-pdf": {
-                    "operation": "export/url",
-                    "input": "convert-to-pdf"
-                }
-            }
-        }
-        
-        # Create job
-        response = requests.post(
-            "https://api.cloudconvert.com/v2/jobs",
-            headers=headers,
-            json=job_data,
-            timeout=30
-        )
-        
-        if response.status_code != 201:
-            error_msg = response.json() if response.text else response.text
-            st.error(f"CloudConvert job creation failed: {error_msg}")
-            return None
-        
-        job_response = response.json()
-        job_id = job_response['data']['id']
-        
-        # Step 2: Upload HTML content to the upload task
-        upload_task = next(task for task in job_response['data']['tasks'] if task['name'] == 'upload-html')
-        upload_task_id = upload_task['id']
-        upload_url = f"https://api.cloudconvert.com/v2/import/upload/{upload_task_id}"
-        
-        # Prepare the file for upload
-        files = {
-            'file': ('standee.html', html_content.encode('utf-8'), 'text/html')
-        }
-        
-        upload_response = requests.post(
-            upload_url,
-            headers={"Authorization": f"Bearer {CLOUDCONVERT_API_KEY}"},
-            files=files,
-            timeout=60
-        )
-        
-        if upload_response.status_code not in [200, 201]:
-            st.error(f"HTML upload failed: {upload_response.text}")
-            return None
-        
-        # Step 3: Wait for job completion
-        max_wait = 60  # 60 seconds timeout
-        start_time = time.time()
-        
-        while time.time() - start_time < max_wait:
-            # Check job status
-            status_response = requests.get(
-                f"https://api.cloudconvert.com/v2/jobs/{job_id}",
-                headers=headers,
-                timeout=10
-            )
-            
-            if status_response.status_code != 200:
-                st.error(f"Job status check failed: {status_response.text}")
-                return None
-            
-            job_status = status_response.json()
-            status = job_status['data']['status']
-            
-            if status == 'finished':
-                # Get download URL
-                export_task = next(task for task in job_status['data']['tasks'] if task['name'] == 'export-pdf')
+        if renderer is None:
+            renderer = get_pdf_renderer()
+        
+        # CloudConvert needs an API key; the local backend does not
+        if renderer.name == CloudConvertRenderer.name and not CLOUDCONVERT_API_KEY:
+            show_warning("⚠️ CloudConvert API key not configured. Rendering locally instead.")
+            renderer = LocalRenderer()
+        
+        # Serve unchanged records straight from the on-disk PDF cache
+        cache = get_pdf_cache()
+        cache_keys = [standee_pdf_cache_key(row_data, renderer.name, renderer.cache_settings()) for row_data in rows]
+        pdfs = [cache.get(cache_key) for cache_key in cache_keys]
+        misses = [index for index, pdf_bytes in enumerate(pdfs) if not pdf_bytes]
+        
+        if misses:
+            rendered = renderer.render_many([rows[index] for index in misses])
+            for index, pdf_bytes in zip(misses, rendered):
+                cache_key = cache_keys[index]
+                
+                if not pdf_bytes and renderer.name != LocalRenderer.name:
+                    show_warning("CloudConvert conversion failed. Rendering locally instead.")
+                    cache_key = standee_pdf_cache_key(rows[index], LocalRenderer.name, LocalRenderer().cache_settings())
+                    pdf_bytes = _render_locally(rows[index])
                 
-                if 'result' in export_task and 'files' in export_task['result']:
-                    download_url = export_task['result']['files'][0]['url']
-                    
-                    # Download PDF
-                    pdf_response = requests.get(download_url, timeout=30)
-                    if pdf_response.status_code == 200:
-                        return pdf_response.content
-                    else:
-                        st.error(f"PDF download failed: {pdf_response.text}")
-                        return None
-                else:
-                    st.error("No download URL found in export task")
-                    return None
-            
-            elif status == 'error':
-                # Get detailed error information
-                error_tasks = [t for t in job_status['data']['tasks'] if t.get('status') == 'error']
-                error_msg = error_tasks[0].get('message', 'Unknown error') if error_tasks else 'Unknown error'
-                st.error(f"CloudConvert job failed: {error_msg}")
-                return None
-            
-            # Wait before checking again
-            time.sleep(2)
+                if pdf_bytes:
+                    cache.put(cache_key, pdf_bytes)
+                pdfs[index] = pdf_bytes
         
-        st.error("CloudConvert job timeout")
-        return None
+        return pdfs
     
     except Exception as e:
-        st.error(f"CloudConvert API error: {str(e)}")
-        import traceback
-        st.error(f"Traceback: {traceback.format_exc()}")
+        # Callers serve these bytes as PDFs, so fall back to local PDFs, never HTML
+        show_error(f"Error generating PDF: {str(e)}")
+        return [_render_locally(row_data) for row_data in rows]
+
+def _render_locally(row_data: Dict) -> Optional[bytes]:
+    """Render one standee with the local backend, or None if that fails too"""
+    try:
+        return LocalRenderer().render(row_data)
+    except Exception as e:
+        show_error(f"Local PDF rendering failed for {row_data.get('name', '')}: {str(e)}")
         return None
 
-def generate_standee_html_fallback(row_data: Dict) -> bytes:
+def generate_standee_pdf(row_data: Dict, renderer: Optional[StandeePDFRenderer] = None) -> Optional[bytes]:
     """
-    Fallback: Generate HTML file when CloudConvert is not available
+    Generate PDF with 2x2 layout using the configured rendering backend
     
     Args:
         row_data: Dictionary containing AI Spot data
+        renderer: Backend to use (None for get_pdf_renderer())
+    
+    Returns:
+        bytes: PDF file as bytes or None if failed
+    """
+    return generate_standee_pdfs([row_data], renderer)[0]
+
+def convert_html_to_pdf_cloudconvert(html_content: str, filename_prefix: str = "standee") -> Optional[bytes]:
+    """
+    Convert HTML to PDF using the shared CloudConvert client
+    
+    The HTML is sent inline with the job and the job is polled with adaptive
+    backoff; the job's per-phase timings are logged.
+    
+    Args:
+        html_content: HTML string
+        filename_prefix: Prefix for the filename
     
     Returns:
-        bytes: HTML file as bytes
+        bytes: PDF content or None if failed
     """
     try:
-        # Load the standee template
-        template_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'tablestandee.html')
-        
-        with open(template_path, 'r', encoding='utf-8') as f:
-            html_template = f.read()
-        
-        # Replace placeholders with actual data
-        html_content = html_template.replace('{{name}}', row_data.get('name', ''))
-        html_content = html_content.replace('{{type_of_place}}', row_data.get('type_of_place', ''))
-        html_content = html_content.replace('{{manager_name}}', row_data.get('owner_manager_name', ''))
-        html_content = html_content.replace('{{aispot_id}}', row_data.get('aispot_id', '')[:8])
-        html_content = html_content.replace('{{qr_code_link}}', row_data.get('qr_code_link', ''))
-        
-        # Remove download section
-        html_content = html_content.replace('<div class="download-section">', '<div class="download-section" style="display: none;">')
-        
-        # Create 2x2 grid
-        grid_html = create_2x2_grid_html(html_content)
-        
-        return grid_html.encode('utf-8')
+        client = get_cloudconvert_client(CLOUDCONVERT_API_KEY)
+        job = client.submit_html(html_content)
+        pdf_bytes = client.wait(job)
+        logger.info(f"CloudConvert timings for {filename_prefix}: {dict(job.timings, polls=job.polls)}")
+        return pdf_bytes
+    
+    except CloudConvertError as e:
+        show_error(str(e))
+        return None
     
     except Exception as e:
-        st.error(f"Error generating HTML fallback: {str(e)}")
+        show_error(f"CloudConvert API error: {str(e)}")
+        import traceback
+        show_error(f"Traceback: {traceback.format_exc()}")
         return None
 
 def create_2x2_grid_html(standee_html: str) -> str:
@@ -389,19 +397,8 @@ def generate_preview_html(row_data: Dict) -> str:
         str: HTML content for preview
     """
     try:
-        template_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'tablestandee.html')
-        
-        with open(template_path, 'r', encoding='utf-8') as f:
-            html_template = f.read()
-        
-        html_content = html_template.replace('{{name}}', row_data.get('name', ''))
-        html_content = html_content.replace('{{type_of_place}}', row_data.get('type_of_place', ''))
-        html_content = html_content.replace('{{manager_name}}', row_data.get('owner_manager_name', ''))
-        html_content = html_content.replace('{{aispot_id}}', row_data.get('aispot_id', '')[:8])
-        html_content = html_content.replace('{{qr_code_link}}', row_data.get('qr_code_link', ''))
-        
-        return html_content
+        return render_standee_html(row_data)
     
     except Exception as e:
-        st.error(f"Error generating HTML preview: {str(e)}")
+        show_error(f"Error generating HTML preview: {str(e)}")
         return ""
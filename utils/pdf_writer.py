@@ -0,0 +1,169 @@
+"""
+PDF Writer utility module
+Minimal streaming PDF writer for full-page raster images (one JPEG per page)
+"""
+
+from io import BytesIO
+from typing import BinaryIO, Tuple
+
+# A4 portrait in PDF points (1/72 inch)
+A4_POINTS = (595.28, 841.89)
+
+class ImagePDFWriter:
+    """
+    Write a PDF whose pages are full-bleed JPEG images
+
+    Pages are written to the output as they are added, so a document of any
+    length only ever holds one page image in memory. Call close() to write
+    the page tree, cross-reference table and trailer.
+    """
+
+    # Object ids 1 and 2 are reserved for the catalog and the page tree
+    _CATALOG_ID = 1
+    _PAGES_ID = 2
+
+    def __init__(self, fileobj: BinaryIO, page_size: Tuple[float, float] = A4_POINTS):
+        self._file = fileobj
+        self._page_size = page_size
+        self._position = 0
+        self._offsets = {}
+        self._next_id = 3
+        self._page_ids = []
+        self._closed = False
+
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._position += len(data)
+
+    def _allocate_id(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _write_object(self, obj_id: int, body: bytes, stream: bytes = None):
+        self._offsets[obj_id] = self._position
+        self._write(f"{obj_id} 0 obj\n".encode('ascii'))
+        self._write(body)
+        if stream is not None:
+            self._write(b"\nstream\n")
+            self._write(stream)
+            self._write(b"\nendstream")
+        self._write(b"\nendobj\n")
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_ids)
+
+    def add_jpeg_page(self, jpeg_bytes: bytes, width_px: int, height_px: int, grayscale: bool = False):
+        """
+        Append a page showing a JPEG image stretched to the page size
+
+        Args:
+            jpeg_bytes: Baseline JPEG data (embedded as-is with DCTDecode)
+            width_px: Image width in pixels
+            height_px: Image height in pixels
+            grayscale: True for single-channel JPEGs
+        """
+        image_id = self._allocate_id()
+        content_id = self._allocate_id()
+        page_id = self._allocate_id()
+        page_width, page_height = self._page_size
+        color_space = "/DeviceGray" if grayscale else "/DeviceRGB"
+
+        self._write_object(
+            image_id,
+            (f"<< /Type /XObject /Subtype /Image /Width {width_px} /Height {height_px} "
+             f"/ColorSpace {color_space} /BitsPerComponent 8 /Filter /DCTDecode "
+             f"/Length {len(jpeg_bytes)} >>").encode('ascii'),
+            jpeg_bytes
+        )
+
+        content = f"q {page_width:.2f} 0 0 {page_height:.2f} 0 0 cm /Im0 Do Q".encode('ascii')
+        self._write_object(content_id, f"<< /Length {len(content)} >>".encode('ascii'), content)
+
+        self._write_object(
+            page_id,
+            (f"<< /Type /Page /Parent {self._PAGES_ID} 0 R "
+             f"/MediaBox [0 0 {page_width:.2f} {page_height:.2f}] "
+             f"/Resources << /XObject << /Im0 {image_id} 0 R >> >> "
+             f"/Contents {content_id} 0 R >>").encode('ascii')
+        )
+        self._page_ids.append(page_id)
+
+    def add_image_page(self, image, quality: int = 90, subsampling: int = 0):
+        """
+        Append a page from a PIL image (encoded to JPEG)
+
+        Args:
+            image: PIL.Image.Image in RGB or L mode
+            quality: JPEG quality
+            subsampling: Chroma subsampling (0 = 4:4:4, 2 = 4:2:0)
+        """
+        self.add_jpeg_page(*encode_jpeg_page(image, quality, subsampling))
+
+    def close(self):
+        """Write the page tree, catalog, xref table and trailer"""
+        if self._closed:
+            return
+        self._closed = True
+
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self._write_object(
+            self._PAGES_ID,
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>".encode('ascii')
+        )
+        self._write_object(
+            self._CATALOG_ID,
+            f"<< /Type /Catalog /Pages {self._PAGES_ID} 0 R >>".encode('ascii')
+        )
+
+        xref_position = self._position
+        object_count = self._next_id
+        lines = [f"xref\n0 {object_count}\n", "0000000000 65535 f \n"]
+        for obj_id in range(1, object_count):
+            lines.append(f"{self._offsets[obj_id]:010d} 00000 n \n")
+        self._write("".join(lines).encode('ascii'))
+        self._write(
+            (f"trailer\n<< /Size {object_count} /Root {self._CATALOG_ID} 0 R >>\n"
+             f"startxref\n{xref_position}\n%%EOF\n").encode('ascii')
+        )
+
+def encode_jpeg_page(image, quality: int = 90, subsampling: int = 0) -> Tuple[bytes, int, int, bool]:
+    """
+    Encode a PIL image for add_jpeg_page (safe to run on worker threads)
+
+    Args:
+        image: PIL.Image.Image
+        quality: JPEG quality
+        subsampling: Chroma subsampling (0 = 4:4:4, 2 = 4:2:0)
+
+    Returns:
+        Tuple of (jpeg_bytes, width_px, height_px, grayscale)
+    """
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=quality, subsampling=subsampling)
+    return buffer.getvalue(), image.width, image.height, image.mode == 'L'
+
+def images_to_pdf_bytes(images, quality: int = 90, subsampling: int = 0) -> bytes:
+    """
+    Build an in-memory PDF with one page per image
+
+    Args:
+        images: Iterable of PIL images
+        quality: JPEG quality
+        subsampling: Chroma subsampling (0 = 4:4:4, 2 = 4:2:0)
+
+    Returns:
+        bytes: PDF document
+    """
+    buffer = BytesIO()
+    writer = ImagePDFWriter(buffer)
+    for image in images:
+        writer.add_image_page(image, quality=quality, subsampling=subsampling)
+    writer.close()
+    return buffer.getvalue()
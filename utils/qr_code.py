@@ -0,0 +1,82 @@
+"""
+QR Code utility module
+Generates standee QR codes locally with a content-addressed disk cache
+"""
+
+import os
+import base64
+import hashlib
+import tempfile
+from functools import lru_cache
+from io import BytesIO
+import qrcode
+from qrcode import constants as qr_constants
+from utils.config import CACHE_DIR
+
+QR_CACHE_DIR = os.path.join(CACHE_DIR, 'qr')
+
+# Module size in pixels; ~410px for a typical link, plenty for a 1.45in print
+QR_BOX_SIZE = 12
+QR_BORDER = 1
+
+def qr_cache_key(link: str, error_correction: str = 'H') -> str:
+    """Content address of a QR image: hash of error-correction level and link"""
+    return hashlib.sha256(f"{error_correction}|{link}".encode('utf-8')).hexdigest()
+
+def _generate_qr_png(link: str, error_correction: str) -> bytes:
+    qr = qrcode.QRCode(
+        error_correction=getattr(qr_constants, f"ERROR_CORRECT_{error_correction}"),
+        box_size=QR_BOX_SIZE,
+        border=QR_BORDER,
+    )
+    qr.add_data(link)
+    qr.make(fit=True)
+
+    image = qr.make_image(fill_color="black", back_color="white").get_image().convert('1')
+    buffer = BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+@lru_cache(maxsize=512)
+def qr_code_png(link: str, error_correction: str = 'H') -> bytes:
+    """
+    Get the QR code PNG for a link, generating and caching it on first use
+
+    Args:
+        link: Data encoded in the QR code
+        error_correction: One of L, M, Q, H
+
+    Returns:
+        bytes: PNG image
+    """
+    path = os.path.join(QR_CACHE_DIR, f"{qr_cache_key(link, error_correction)}.png")
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+
+    png_bytes = _generate_qr_png(link, error_correction)
+
+    # Write atomically so concurrent renders never read a partial file
+    try:
+        os.makedirs(QR_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=QR_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(png_bytes)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Read-only filesystem: still serve from memory
+
+    return png_bytes
+
+@lru_cache(maxsize=512)
+def qr_code_src(link: str, error_correction: str = 'H') -> str:
+    """
+    Get an <img> src for a link's QR code
+
+    Returns:
+        str: Inline PNG data URI
+    """
+    png_bytes = qr_code_png(link, error_correction)
+    return "data:image/png;base64," + base64.b64encode(png_bytes).decode('ascii')
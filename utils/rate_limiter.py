@@ -0,0 +1,74 @@
+"""
+Rate limiter utility module
+Token buckets that keep outgoing email under the SMTP provider's quota
+"""
+
+import os
+import time
+import threading
+from typing import List, Optional
+
+# Provider quota (smtpout.secureserver.net); 0 disables a limit
+SMTP_RATE_PER_SECOND = float(os.getenv("SMTP_RATE_PER_SECOND", "2"))
+SMTP_RATE_PER_MINUTE = float(os.getenv("SMTP_RATE_PER_MINUTE", "60"))
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Holds up to `capacity` tokens and refills at `rate` tokens per second.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class RateLimiter:
+    """Combined per-second and per-minute limit"""
+
+    def __init__(self, per_second: float = SMTP_RATE_PER_SECOND, per_minute: float = SMTP_RATE_PER_MINUTE):
+        self.buckets: List[TokenBucket] = []
+        if per_second > 0:
+            self.buckets.append(TokenBucket(per_second, max(1.0, per_second)))
+        if per_minute > 0:
+            self.buckets.append(TokenBucket(per_minute / 60.0, max(1.0, per_minute)))
+
+    def acquire(self):
+        """Block until every configured limit allows one more message"""
+        for bucket in self.buckets:
+            bucket.acquire()
+
+_smtp_limiter: Optional[RateLimiter] = None
+_smtp_limiter_lock = threading.Lock()
+
+def get_smtp_rate_limiter() -> RateLimiter:
+    """
+    Get the process-wide limiter shared by every SMTP send
+
+    Returns:
+        RateLimiter configured from SMTP_RATE_PER_SECOND / SMTP_RATE_PER_MINUTE
+    """
+    global _smtp_limiter
+    with _smtp_limiter_lock:
+        if _smtp_limiter is None:
+            _smtp_limiter = RateLimiter()
+        return _smtp_limiter
@@ -0,0 +1,168 @@
+"""
+Search index utility module
+Precomputed search haystack and facet masks for filtering the AI Spots table
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Columns matched by the free-text search box
+SEARCH_COLUMNS = ('name', 'type_of_place', 'city', 'state')
+
+# Columns with one precomputed mask per distinct value
+FACET_COLUMNS = ('type_of_place', 'state')
+
+# Recent search terms whose match masks are kept
+SEARCH_CACHE_SIZE = 64
+
+def _lowered(series: pd.Series) -> pd.Series:
+    """Lowercased text of a column, with missing values as ''"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Lowercase each category once, then expand by code (code -1 is missing)
+        lowered = series.cat.categories.astype(str).str.lower().to_numpy(dtype=object)
+        lowered = np.append(lowered, '')
+        return pd.Series(lowered[series.cat.codes.to_numpy()], index=series.index)
+    return series.astype(object).fillna('').astype(str).str.lower()
+
+class SearchIndex:
+    """
+    Filter masks for one version of the AI Spots DataFrame
+
+    Built once per data version: a lowercased haystack (the search columns
+    joined with a separator that cannot be typed into the search box), a
+    boolean mask and row count per facet value and the approved / pending
+    masks. Sort orders are row permutations computed on first use. Filters
+    combine as mask intersections, and only the final row selection copies
+    data.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.version = df.attrs.get('version')
+        self.size = len(df)
+        self._df = df
+
+        parts = [_lowered(df[column]) if column in df else pd.Series('', index=df.index)
+                 for column in SEARCH_COLUMNS]
+        haystack = parts[0]
+        for part in parts[1:]:
+            haystack = haystack + '\x1f' + part
+        self.haystack = haystack.to_numpy(dtype=object)
+
+        # Facet value -> row mask, and facet value -> row count (sorted by value)
+        self.facets: Dict[str, Dict[str, np.ndarray]] = {}
+        self.facet_counts: Dict[str, Dict[str, int]] = {}
+        for column in FACET_COLUMNS:
+            series = df[column] if column in df else pd.Series(None, index=df.index, dtype=object)
+            counts = series.value_counts(sort=False)
+            counts = counts[counts > 0]
+            values = series.to_numpy(dtype=object)
+            self.facets[column] = {value: values == value for value in counts.index}
+            self.facet_counts[column] = {value: int(counts[value]) for value in sorted(counts.index)}
+
+        approved = df['is_approved'] if 'is_approved' in df else pd.Series(False, index=df.index)
+        self.approval = {
+            'Approved': (approved == True).to_numpy(),
+            'Pending': (approved == False).to_numpy()
+        }
+
+        self._search_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def _search(self, term: str) -> np.ndarray:
+        """Rows whose haystack contains term (literal, case-insensitive)"""
+        with self._lock:
+            cached = self._search_cache.get(term)
+            if cached is not None:
+                self._search_cache.move_to_end(term)
+                return cached
+
+            # Narrow from the longest cached prefix of this term when there is one
+            base = None
+            for length in range(len(term) - 1, 0, -1):
+                base = self._search_cache.get(term[:length])
+                if base is not None:
+                    break
+
+        candidates = np.flatnonzero(base) if base is not None else np.arange(self.size)
+        mask = np.zeros(self.size, dtype=bool)
+        mask[candidates] = [term in self.haystack[i] for i in candidates]
+
+        with self._lock:
+            self._search_cache[term] = mask
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        return mask
+
+    def mask(self, search_query: Optional[str], type_filter: str = "All",
+             approval_filter: str = "All", state_filter: str = "All") -> np.ndarray:
+        """
+        Combined boolean mask for the dashboard filters
+
+        Args:
+            search_query: Free-text search (matched literally, not as a regex)
+            type_filter: Type of place, or "All"
+            approval_filter: "Approved", "Pending" or "All"
+            state_filter: State, or "All"
+
+        Returns:
+            numpy bool array aligned with the indexed DataFrame
+        """
+        mask = np.ones(self.size, dtype=bool)
+        no_rows = np.zeros(self.size, dtype=bool)
+
+        if type_filter != "All":
+            mask &= self.facets['type_of_place'].get(type_filter, no_rows)
+        if approval_filter != "All":
+            mask &= self.approval.get(approval_filter, no_rows)
+        if state_filter != "All":
+            mask &= self.facets['state'].get(state_filter, no_rows)
+
+        term = (search_query or '').strip().lower()
+        if term:
+            mask &= self._search(term)
+
+        return mask
+
+    def order(self, column: str, ascending: bool = True) -> np.ndarray:
+        """
+        Row positions sorted by a column (stable, missing values last)
+
+        Args:
+            column: Column to sort by
+            ascending: Sort direction
+
+        Returns:
+            numpy array of row positions
+        """
+        key = (column, ascending)
+        with self._lock:
+            positions = self._orders.get(key)
+        if positions is None:
+            positions = (
+                self._df[column]
+                .reset_index(drop=True)
+                .sort_values(ascending=ascending, kind='stable', na_position='last')
+                .index.to_numpy()
+            )
+            with self._lock:
+                self._orders[key] = positions
+        return positions
+
+    def select(self, mask: np.ndarray, column: str, ascending: bool = True) -> np.ndarray:
+        """
+        Positions of the rows in mask, in sorted order
+
+        Args:
+            mask: Row mask from mask()
+            column: Column to sort by
+            ascending: Sort direction
+
+        Returns:
+            numpy array of row positions (use with DataFrame.iloc)
+        """
+        positions = self.order(column, ascending)
+        return positions[mask[positions]]
@@ -0,0 +1,253 @@
+"""
+SMTP session pool module
+Keeps authenticated SMTP connections alive and reuses them across sends
+"""
+
+import os
+import time
+import atexit
+import smtplib
+import hashlib
+import threading
+from typing import Dict, Optional
+from utils.rate_limiter import RateLimiter, get_smtp_rate_limiter
+
+# Connection recycling configuration
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "50"))
+SMTP_MAX_CONNECTION_AGE = float(os.getenv("SMTP_MAX_CONNECTION_AGE", "240"))  # seconds
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))  # seconds
+SMTP_IDLE_CHECK_SECONDS = float(os.getenv("SMTP_IDLE_CHECK_SECONDS", "5"))  # NOOP idle connections older than this
+
+class _DataTracking:
+    """Records whether DATA was started, after which a failed send may still have been delivered"""
+
+    data_started = False
+
+    def data(self, msg):
+        self.data_started = True
+        return super().data(msg)
+
+class _SMTP(_DataTracking, smtplib.SMTP):
+    pass
+
+class _SMTP_SSL(_DataTracking, smtplib.SMTP_SSL):
+    pass
+
+class _PooledConnection:
+    """An authenticated SMTP connection plus its usage counters"""
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.sent = 0
+
+    def is_alive(self) -> bool:
+        """Check with NOOP that the server still answers on this connection"""
+        try:
+            return self.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def close(self):
+        try:
+            self.server.quit()
+        except Exception:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+
+class SMTPSessionManager:
+    """
+    Pool of authenticated SMTP connections for one server/account
+
+    Each connection sends many messages and is recycled after
+    max_messages sends or max_age seconds. Connections idle for more than
+    SMTP_IDLE_CHECK_SECONDS are checked with NOOP before reuse. A send that
+    fails on a dropped connection before DATA reconnects and retries once;
+    after DATA the server may already have accepted the message, so it is
+    never resent. An optional rate limiter is consulted before every send,
+    including the retry.
+    """
+
+    def __init__(self, host: str, port: int, use_ssl: bool, username: str, password: str,
+                 pool_size: int = SMTP_POOL_SIZE,
+                 max_messages: int = SMTP_MAX_MESSAGES_PER_CONNECTION,
+                 max_age: float = SMTP_MAX_CONNECTION_AGE,
+                 timeout: float = SMTP_TIMEOUT,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.username = username
+        self.password = password
+        self.max_messages = max_messages
+        self.max_age = max_age
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, pool_size))
+
+    def _connect(self) -> _PooledConnection:
+        """Open, secure and authenticate a new connection"""
+        if self.use_ssl:
+            # Use SSL (port 465)
+            server = _SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            # Use TLS (port 587)
+            server = _SMTP(self.host, self.port, timeout=self.timeout)
+            server.starttls()
+
+        try:
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+
+        return _PooledConnection(server)
+
+    def _is_expired(self, conn: _PooledConnection) -> bool:
+        return (conn.sent >= self.max_messages or
+                time.monotonic() - conn.created_at >= self.max_age)
+
+    def _checkout(self) -> _PooledConnection:
+        """Take a fresh, live idle connection or open a new one"""
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._connect()
+            if self._is_expired(conn):
+                conn.close()
+                continue
+            if time.monotonic() - conn.last_used > SMTP_IDLE_CHECK_SECONDS and not conn.is_alive():
+                conn.close()
+                continue
+            return conn
+
+    def _checkin(self, conn: _PooledConnection):
+        """Return a connection to the pool, or close it if it is used up"""
+        if self._is_expired(conn):
+            conn.close()
+            return
+        conn.last_used = time.monotonic()
+        with self._lock:
+            self._idle.append(conn)
+
+    def _reconnect_and_send(self, conn: _PooledConnection, msg) -> Optional[_PooledConnection]:
+        """Replace a dropped connection and retry the send once, or return None if DATA had started"""
+        conn.close()
+        if conn.server.data_started:
+            # The message may already have been accepted: resending could duplicate it
+            return None
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        conn = self._connect()
+        try:
+            conn.server.send_message(msg)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def send_message(self, msg) -> None:
+        """
+        Send a message over a pooled connection
+
+        Args:
+            msg: email.message.Message to send
+
+        Raises:
+            smtplib.SMTPException: If the send fails after one reconnect
+            OSError: If the connection drops after DATA started (not retried)
+        """
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+
+        with self._slots:
+            conn = self._checkout()
+            conn.server.data_started = False
+            try:
+                conn.server.send_message(msg)
+            except smtplib.SMTPRecipientsRefused:
+                # Connection is still healthy, only this message was rejected
+                self._checkin(conn)
+                raise
+            except smtplib.SMTPServerDisconnected:
+                conn = self._reconnect_and_send(conn, msg)
+                if conn is None:
+                    raise
+            except smtplib.SMTPException:
+                # The server answered, so the connection was not stale: don't resend
+                conn.close()
+                raise
+            except OSError:
+                # Stale pooled connection (reset, ssl.SSLError, socket timeout)
+                conn = self._reconnect_and_send(conn, msg)
+                if conn is None:
+                    raise
+            except Exception:
+                conn.close()
+                raise
+
+            conn.sent += 1
+            self._checkin(conn)
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+_pools: Dict[str, SMTPSessionManager] = {}
+_pools_lock = threading.Lock()
+
+def get_smtp_pool(config: Dict) -> SMTPSessionManager:
+    """
+    Get the shared session manager for an email configuration
+
+    Args:
+        config: Email configuration from get_email_config()
+
+    Returns:
+        SMTPSessionManager shared by every sender using the same account
+    """
+    key_source = f"{config['host']}|{config['port']}|{config['use_ssl']}|{config['email']}|{config['password']}"
+    key = hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = SMTPSessionManager(
+                config['host'],
+                int(config['port']),
+                bool(config['use_ssl']),
+                config['email'],
+                config['password'],
+                rate_limiter=get_smtp_rate_limiter()
+            )
+            _pools[key] = pool
+        return pool
+
+def send_email_message(config: Dict, msg) -> None:
+    """
+    Send a message through the shared pool for this configuration
+
+    Args:
+        config: Email configuration from get_email_config()
+        msg: email.message.Message to send
+    """
+    get_smtp_pool(config).send_message(msg)
+
+@atexit.register
+def close_all_pools():
+    """Close idle connections in every pool (runs at interpreter exit)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
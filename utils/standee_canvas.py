@@ -0,0 +1,415 @@
+"""
+Standee Canvas utility module
+Draws the table standee and its 2x2 A4 print sheet directly with Pillow
+
+Layout mirrors templates/tablestandee.html and create_2x2_grid_html();
+all measurements below are CSS pixels (96 per inch) taken from the template.
+"""
+
+import os
+from functools import lru_cache
+from io import BytesIO
+from typing import Dict, List, Tuple
+from PIL import Image, ImageDraw, ImageFont
+from utils.qr_code import qr_code_png
+from utils.template_renderer import standee_fields, STANDEE_FIELDS
+
+# Output resolution of the A4 sheet
+STANDEE_SHEET_DPI = int(os.getenv("STANDEE_SHEET_DPI", "300"))
+
+# Bump whenever the drawing code changes its output, so cached PDFs are re-rendered
+STANDEE_LAYOUT_VERSION = 1
+
+CSS_PX_PER_INCH = 96.0
+A4_INCHES = (8.27, 11.69)
+
+# Standee box (4in x 6in) as placed in the 2x2 grid: 3.8in x 5.7in scaled by 0.95
+STANDEE_INCHES = (4.0, 6.0)
+GRID_STANDEE_SCALE = (3.8 / 4.0) * 0.95
+GRID_MARGINS_INCHES = (0.35, 0.3)  # left/right, top/bottom (@page margin)
+GRID_GAP_INCHES = 0.2
+
+FONT_CANDIDATES = {
+    False: [os.getenv("STANDEE_FONT", ""), "DejaVuSans.ttf", "LiberationSans-Regular.ttf", "Arial.ttf"],
+    True: [os.getenv("STANDEE_FONT_BOLD", ""), "DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf", "Arial Bold.ttf"],
+}
+
+# Colors from the template stylesheet
+WHITE = (255, 255, 255)
+NAVY = (0, 51, 102)
+BLUE = (0, 85, 170)
+SKY = (102, 204, 255)
+PALE_BLUE = (163, 217, 255)
+SOFT_BLUE = (204, 231, 255)
+ICE = (230, 247, 255)
+MINT = (102, 255, 204)
+GOLD = (255, 215, 0)
+STEP_TOP = (0, 64, 128)
+STEP_BORDER = (41, 105, 168)  # rgba(102,204,255,0.4) over the step gradient
+FOOTER_RULE = (36, 110, 181)  # rgba(102,204,255,0.3) over the page gradient
+CUT_GUIDE = (204, 204, 204)
+
+@lru_cache(maxsize=64)
+def _font(size_px: int, bold: bool) -> ImageFont.FreeTypeFont:
+    """Load the first available TrueType font, falling back to Pillow's bundled one"""
+    for candidate in FONT_CANDIDATES[bold]:
+        if not candidate:
+            continue
+        try:
+            return ImageFont.truetype(candidate, size_px)
+        except OSError:
+            continue
+    return ImageFont.load_default(size=size_px)
+
+def _vertical_gradient(size: Tuple[int, int], top: Tuple[int, int, int], bottom: Tuple[int, int, int]) -> Image.Image:
+    mask = Image.linear_gradient('L').resize(size)
+    return Image.composite(Image.new('RGB', size, bottom), Image.new('RGB', size, top), mask)
+
+class _StandeeCanvas:
+    """
+    Pillow drawing surface addressed in CSS pixels
+
+    A zoom around an anchor point lets the flowing content block shrink to
+    fit when fallback fonts run wider than the template's web fonts. In
+    dry-run mode nothing is drawn, so a pass can be used to measure layout.
+    """
+
+    def __init__(self, pixels_per_inch: float):
+        self.base_scale = pixels_per_inch / CSS_PX_PER_INCH
+        self.dry_run = False
+        self.set_zoom(1.0)
+        width = self.px(STANDEE_INCHES[0] * CSS_PX_PER_INCH)
+        height = self.px(STANDEE_INCHES[1] * CSS_PX_PER_INCH)
+        self.image = _vertical_gradient((width, height), NAVY, BLUE)
+        self.draw = ImageDraw.Draw(self.image)
+
+    def set_zoom(self, zoom: float, anchor_x: float = 0.0, anchor_y: float = 0.0):
+        """Scale subsequent drawing by zoom, keeping (anchor_x, anchor_y) fixed"""
+        self.scale = self.base_scale * zoom
+        self._origin = (anchor_x * (self.base_scale - self.scale), anchor_y * (self.base_scale - self.scale))
+
+    def px(self, css_px: float) -> int:
+        return int(round(css_px * self.scale))
+
+    def point(self, x: float, y: float) -> Tuple[int, int]:
+        return (int(round(self._origin[0] + x * self.scale)), int(round(self._origin[1] + y * self.scale)))
+
+    def font(self, css_size: float, bold: bool = False) -> ImageFont.FreeTypeFont:
+        return _font(max(1, self.px(css_size)), bold)
+
+    def text_width(self, text: str, css_size: float, bold: bool = False) -> float:
+        return self.font(css_size, bold).getlength(text) / self.scale
+
+    def text(self, x: float, y: float, text: str, css_size: float, color, bold: bool = False):
+        if not self.dry_run:
+            self.draw.text(self.point(x, y), text, font=self.font(css_size, bold), fill=color)
+
+    def layout(self, runs: List[Tuple[str, bool, tuple]], width: float, css_size: float) -> List[List[Tuple[str, bool, tuple, float]]]:
+        """
+        Word-wrap styled runs to a width
+
+        Args:
+            runs: (text, bold, color) tuples
+            width: Available width in CSS px
+            css_size: Font size in CSS px
+
+        Returns:
+            Lines of (word, bold, color, width) tuples
+        """
+        lines, line, line_width = [], [], 0.0
+        for text, bold, color in runs:
+            for word in text.split(" "):
+                if word == '':
+                    continue
+                word_width = self.text_width(word, css_size, bold)
+                space = self.text_width(' ', css_size, bold) if line else 0.0
+                if line and line_width + space + word_width > width:
+                    lines.append(line)
+                    line, line_width, space = [], 0.0, 0.0
+                line.append((word, bold, color, word_width))
+                line_width += space + word_width
+        if line:
+            lines.append(line)
+        return lines
+
+    def draw_lines(self, lines, x: float, y: float, width: float, css_size: float, line_height: float, align: str = 'center') -> float:
+        """Draw laid-out lines; returns the y coordinate below the last line"""
+        space = self.text_width(' ', css_size)
+        for line in lines:
+            total = sum(word_width for _, _, _, word_width in line) + space * (len(line) - 1)
+            cursor = x + (width - total) / 2 if align == 'center' else x
+            baseline_offset = (line_height - css_size) / 2
+            for word, bold, color, word_width in line:
+                self.text(cursor, y + baseline_offset, word, css_size, color, bold)
+                cursor += word_width + space
+            y += line_height
+        return y
+
+    def paragraph(self, runs, x: float, y: float, width: float, css_size: float, line_height: float, align: str = 'center') -> float:
+        return self.draw_lines(self.layout(runs, width, css_size), x, y, width, css_size, line_height, align)
+
+    def rounded_box(self, box: Tuple[float, float, float, float], radius: float, fill=None, outline=None, outline_width: float = 0):
+        if self.dry_run:
+            return
+        x0, y0, x1, y1 = box
+        self.draw.rounded_rectangle(
+            self.point(x0, y0) + self.point(x1, y1),
+            radius=self.px(radius),
+            fill=fill,
+            outline=outline,
+            width=max(1, self.px(outline_width)) if outline else 0
+        )
+
+    def line(self, x0: float, y0: float, x1: float, y1: float, color, css_width: float):
+        if not self.dry_run:
+            self.draw.line(self.point(x0, y0) + self.point(x1, y1), fill=color, width=max(1, self.px(css_width)))
+
+    def paste(self, image: Image.Image, x: float, y: float, mask: Image.Image = None):
+        if not self.dry_run:
+            self.image.paste(image, self.point(x, y), mask)
+
+def _draw_content(canvas: _StandeeCanvas, values: Dict[str, str], left: float, width: float, y: float) -> float:
+    """Draw the flowing .container content from y; returns the bottom y"""
+    inch = CSS_PX_PER_INCH
+    gap = 0.04 * inch
+
+    # .header: "you are in an  AI SPOT  network"
+    y += 0.08 * inch
+    side_left, side_right, brand = "you are in an", "network", "AI SPOT"
+    side_left_width = canvas.text_width(side_left, 8, True)
+    side_right_width = canvas.text_width(side_right, 8, True)
+    brand_width = canvas.text_width(brand, 24, True) + 16
+    header_width = side_left_width + brand_width + side_right_width + 12
+    line_height = 24 * 1.3
+    x = left + (width - header_width) / 2
+    canvas.text(x, y + (line_height - 8) / 2, side_left, 8, PALE_BLUE, True)
+    x += side_left_width + 6
+    canvas.rounded_box((x - 2, y + 2, x + brand_width + 2, y + line_height - 2), 4, fill=(19, 85, 145))
+    canvas.text(x + 8, y + (line_height - 24) / 2, brand, 24, WHITE, True)
+    x += brand_width + 6
+    canvas.text(x, y + (line_height - 8) / 2, side_right, 8, PALE_BLUE, True)
+    y += line_height + gap
+
+    # .headline h2
+    y += 0.06 * inch
+    headline = "ARE YOU AI READY?"
+    headline_size = 26
+    while headline_size > 10 and canvas.text_width(headline, headline_size, True) > width - 0.1 * inch:
+        headline_size -= 1
+    y = canvas.paragraph([(headline, True, WHITE)], left, y, width, headline_size, headline_size * 1.1) + gap
+
+    # .desc .intro
+    y += 0.04 * inch
+    y = canvas.paragraph([
+        ("Scan the QR to discover your", True, WHITE),
+        ("AI Readiness Score", True, SKY),
+        ("instantly – it takes just 2 minutes!", True, WHITE),
+    ], left, y, width, 7, 7 * 1.3) + 3 + gap
+
+    # .qr-wrap
+    y += 0.04 * inch
+    qr_size = 1.45 * inch
+    padding, qr_border = 0.08 * inch, 0.04 * inch
+    box_width = 1.6 * inch + 2 * (padding + qr_border)
+    box_height = qr_size + 2 * (padding + qr_border)
+    box_left = left + (width - box_width) / 2
+    canvas.rounded_box((box_left, y, box_left + box_width, y + box_height), 0.08 * inch,
+                       fill=WHITE, outline=SKY, outline_width=qr_border)
+    if not canvas.dry_run:
+        qr_png = qr_code_png(values['qr_code_link'])
+        qr_image = Image.open(BytesIO(qr_png)).convert('RGB')
+        qr_pixels = canvas.px(qr_size)
+        qr_image = qr_image.resize((qr_pixels, qr_pixels), Image.NEAREST)
+        canvas.paste(qr_image, left + (width - qr_size) / 2, y + qr_border + padding)
+    y += box_height + gap
+
+    # .place name and type
+    y += 0.06 * inch
+    y = canvas.paragraph([(values['name'], True, WHITE)], left, y, width, 14, 14 * 1.1)
+    y = canvas.paragraph([(values['type_of_place'], True, SOFT_BLUE)], left, y + 2, width, 8, 8 * 1.2) + gap
+
+    # .flow: three steps separated by arrows
+    y += 0.06 * inch
+    steps = [
+        ("1", "Scan the QR", "Open your phone camera – no app required."),
+        ("2", "Take a 2-Minute Quiz", "Answer 5–6 short questions – quick & fun."),
+        ("3", "Get Your AI Readiness Score", "+ Premium AI library access + a complimentary professional AI Certification course for you"),
+    ]
+    step_width = 1.0 * inch
+    step_pad_y, step_pad_x = 0.04 * inch, 0.03 * inch
+    inner_width = step_width - 2 * step_pad_x
+    arrow_width = canvas.text_width("➜", 10)
+    flow_width = 3 * step_width + 2 * arrow_width + 4 * 4
+    laid_out = []
+    step_height = 0.65 * inch
+    for number, title, body in steps:
+        title_lines = canvas.layout([(title, True, WHITE)], inner_width, 9)
+        body_lines = canvas.layout([(body, False, SOFT_BLUE)], inner_width, 6.5)
+        content = 16 + 2 + len(title_lines) * 9 * 1.2 + 2 + len(body_lines) * 6.5 * 1.3
+        step_height = max(step_height, content + 2 * step_pad_y)
+        laid_out.append((number, title_lines, body_lines))
+
+    x = left + (width - flow_width) / 2
+    for index, (number, title_lines, body_lines) in enumerate(laid_out):
+        if canvas.dry_run:
+            break
+        step_image = _vertical_gradient((canvas.px(step_width), canvas.px(step_height)), STEP_TOP, NAVY)
+        step_mask = Image.new('L', step_image.size, 0)
+        ImageDraw.Draw(step_mask).rounded_rectangle((0, 0, step_image.width - 1, step_image.height - 1),
+                                                    radius=canvas.px(0.04 * inch), fill=255)
+        canvas.paste(step_image, x, y, step_mask)
+        canvas.rounded_box((x, y, x + step_width, y + step_height), 0.04 * inch, outline=STEP_BORDER, outline_width=0.5)
+
+        badge_left = x + (step_width - 16) / 2
+        badge_top = y + step_pad_y
+        canvas.rounded_box((badge_left, badge_top, badge_left + 16, badge_top + 16), 4, fill=SKY)
+        canvas.text(badge_left + (16 - canvas.text_width(number, 10, True)) / 2, badge_top + 2.5, number, 10, NAVY, True)
+
+        text_y = badge_top + 18
+        text_y = canvas.draw_lines(title_lines, x + step_pad_x, text_y, inner_width, 9, 9 * 1.2) + 2
+        canvas.draw_lines(body_lines, x + step_pad_x, text_y, inner_width, 6.5, 6.5 * 1.3)
+
+        x += step_width + 4
+        if index < len(laid_out) - 1:
+            canvas.text(x, y + (step_height - 10) / 2, "➜", 10, SKY)
+            x += arrow_width + 4
+    y += step_height + gap
+
+    # .desc .subtext and benefit list
+    y += 0.04 * inch
+    y = canvas.paragraph([
+        ("There is no sign-up cost, no access cost, and no hidden cost –", True, (163, 228, 255)),
+        ("it's free forever.", True, SKY),
+    ], left, y + 4, width, 7, 7 * 1.5)
+
+    benefits = [
+        [("Personalized AI Readiness Score", True, SKY), ("with an instant", False, ICE),
+         ("AI Learning Roadmap", True, SKY), ("in your inbox.", False, ICE)],
+        [("Lifetime access", True, SKY), ("to AIwithArijit's Premium AI Library – 100+ AI tools, guides & projects.", False, ICE)],
+        [("Learn to", False, ICE), ("build ChatGPTs & AI Agents", True, SKY), ("for your work or business.", False, ICE)],
+        [("Earn AI Certifications", True, SKY), ("– a complimentary gift from", False, ICE), (values['name'], True, SKY),
+         ("and", False, ICE), ("AIwithArijit.com", True, SKY), ("– that boost your LinkedIn & professional profile.", False, ICE)],
+    ]
+    y += 5
+    for runs in benefits:
+        canvas.text(left, y + (7 * 1.6 - 8) / 2, "✓", 8, MINT, True)
+        lines = canvas.layout(runs, width - 12, 7)
+        y = canvas.draw_lines(lines, left + 12, y, width - 12, 7, 7 * 1.6, align='left') + 3
+    y += gap
+
+    # .venue
+    y += 0.03 * inch
+    y = canvas.paragraph([("AI Spot ID:", True, WHITE), (values['aispot_id'], True, SKY)], left, y, width, 5.5, 5.5 * 1.2)
+    return canvas.paragraph([
+        ("Thank", False, SOFT_BLUE), (values['manager_name'], True, SKY),
+        (f"– {values['name']} has converted this place into an official AI Spot. This is their complimentary gift to you.", False, SOFT_BLUE),
+    ], left, y + 2, width, 5, 5 * 1.2)
+
+def _draw_standee(values: Dict[str, str], pixels_per_inch: float) -> Image.Image:
+    canvas = _StandeeCanvas(pixels_per_inch)
+    inch = CSS_PX_PER_INCH
+    page_width, page_height = STANDEE_INCHES[0] * inch, STANDEE_INCHES[1] * inch
+    border = 0.12 * inch
+    gap = 0.04 * inch
+
+    # .page border
+    canvas.draw.rectangle(
+        (0, 0, canvas.image.width - 1, canvas.image.height - 1),
+        outline=SKY,
+        width=canvas.px(border)
+    )
+
+    # .verified-top (absolute, top-right)
+    label = "VERIFIED AI SPOT"
+    stars = "★★★★★ "
+    label_width = canvas.text_width(label, 7, True)
+    stars_width = canvas.text_width(stars, 6)
+    right = page_width - border - 0.2 * inch
+    top = border + 0.15 * inch
+    canvas.text(right - label_width - stars_width, top + 0.5, stars, 6, GOLD)
+    canvas.text(right - label_width, top, label, 7, WHITE, True)
+
+    left = border + 0.18 * inch
+    width = page_width - 2 * left
+    content_top = border + 0.15 * inch
+
+    # .footer (pinned to the bottom of the container)
+    footer_lines = [
+        canvas.layout([("You're part of a growing AI revolution.", False, SOFT_BLUE),
+                       ("Stay curious. Stay relevant. Stay AI ready.", True, SKY)], width, 5),
+        canvas.layout([("© 2025 • AiwithArijit.com", False, SOFT_BLUE)], width, 5),
+    ]
+    line_count = sum(len(lines) for lines in footer_lines)
+    footer_top = page_height - border - 0.06 * inch - 0.02 * inch - line_count * 5 * 1.2 - 0.03 * inch
+    canvas.line(left, footer_top, left + width, footer_top, FOOTER_RULE, 0.5)
+    y = footer_top + 0.03 * inch
+    for lines in footer_lines:
+        y = canvas.draw_lines(lines, left, y, width, 5, 5 * 1.2)
+
+    # Measure the content, then draw it shrunk just enough to clear the footer.
+    # Re-measure after zooming since rounded font sizes can change wrapping.
+    available = footer_top - gap - content_top
+    zoom = 1.0
+    canvas.dry_run = True
+    for _ in range(4):
+        canvas.set_zoom(zoom, page_width / 2, content_top)
+        needed = _draw_content(canvas, values, left, width, content_top) - content_top
+        if needed <= available:
+            break
+        zoom *= available / needed * 0.99
+    canvas.dry_run = False
+    _draw_content(canvas, values, left, width, content_top)
+
+    return canvas.image
+
+def draw_standee(row_data: Dict, pixels_per_inch: float = STANDEE_SHEET_DPI) -> Image.Image:
+    """
+    Draw a single 4in x 6in standee
+
+    Args:
+        row_data: Dictionary (or pandas row) containing AI Spot data
+        pixels_per_inch: Output resolution
+
+    Returns:
+        PIL.Image.Image in RGB mode
+    """
+    values = dict(zip(STANDEE_FIELDS, standee_fields(row_data)))
+    return _draw_standee(values, pixels_per_inch)
+
+def draw_standee_sheet(row_data: Dict, dpi: int = STANDEE_SHEET_DPI) -> Image.Image:
+    """
+    Draw the A4 print sheet: the standee four times in a 2x2 grid with cutting guides
+
+    Args:
+        row_data: Dictionary (or pandas row) containing AI Spot data
+        dpi: Output resolution
+
+    Returns:
+        PIL.Image.Image in RGB mode
+    """
+    sheet_width, sheet_height = int(A4_INCHES[0] * dpi), int(A4_INCHES[1] * dpi)
+    sheet = Image.new('RGB', (sheet_width, sheet_height), WHITE)
+
+    standee = draw_standee(row_data, dpi * GRID_STANDEE_SCALE)
+
+    margin_x, margin_y = GRID_MARGINS_INCHES[0] * dpi, GRID_MARGINS_INCHES[1] * dpi
+    gap = GRID_GAP_INCHES * dpi
+    cell_width = (sheet_width - 2 * margin_x - gap) / 2
+    cell_height = (sheet_height - 2 * margin_y - gap) / 2
+    for row in range(2):
+        for column in range(2):
+            cell_left = margin_x + column * (cell_width + gap)
+            cell_top = margin_y + row * (cell_height + gap)
+            sheet.paste(standee, (int(cell_left + (cell_width - standee.width) / 2),
+                                  int(cell_top + (cell_height - standee.height) / 2)))
+
+    # Dashed cutting guides through the page centre
+    draw = ImageDraw.Draw(sheet)
+    dash, space = int(0.04 * dpi), int(0.03 * dpi)
+    center_x, center_y = sheet_width // 2, sheet_height // 2
+    for start in range(0, sheet_width, dash + space):
+        draw.line((start, center_y, min(start + dash, sheet_width), center_y), fill=CUT_GUIDE, width=max(1, dpi // 96))
+    for start in range(0, sheet_height, dash + space):
+        draw.line((center_x, start, center_x, min(start + dash, sheet_height)), fill=CUT_GUIDE, width=max(1, dpi // 96))
+
+    return sheet
@@ -0,0 +1,118 @@
+"""
+Template Renderer utility module
+Renders the table standee template from a precompiled, mtime-checked cache
+"""
+
+import os
+import re
+import hashlib
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from utils.qr_code import qr_code_src
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'tablestandee.html')
+
+# Placeholder syntax used by tablestandee.html, e.g. {{name}}
+_PLACEHOLDER = re.compile(r'\{\{(\w+)\}\}')
+
+_DOWNLOAD_SECTION = '<div class="download-section">'
+_HIDDEN_DOWNLOAD_SECTION = '<div class="download-section" style="display: none;">'
+
+# Order of the values passed to the compiled template
+STANDEE_FIELDS = ('name', 'type_of_place', 'manager_name', 'aispot_id', 'qr_code_link', 'qr_code_src')
+
+class CompiledTemplate:
+    """
+    Template pre-split into literal text and placeholder slots
+
+    Rendering is a single join over the segment list instead of one
+    str.replace pass over the whole document per placeholder.
+    """
+
+    def __init__(self, source: str, mtime: float):
+        self.mtime = mtime
+        self.version = hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+        self.segments: List[Tuple[bool, str]] = []
+
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            self.segments.append((False, source[position:match.start()]))
+            self.segments.append((True, match.group(1)))
+            position = match.end()
+        self.segments.append((False, source[position:]))
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Fill placeholders; unknown placeholders are left as-is"""
+        return ''.join(
+            values.get(text, '{{' + text + '}}') if is_field else text
+            for is_field, text in self.segments
+        )
+
+_template = None
+_template_lock = threading.Lock()
+
+def get_standee_template() -> CompiledTemplate:
+    """
+    Get the compiled standee template, reloading it only when the file changes
+
+    Returns:
+        CompiledTemplate for templates/tablestandee.html
+    """
+    global _template
+    mtime = os.stat(TEMPLATE_PATH).st_mtime
+
+    with _template_lock:
+        if _template is None or _template.mtime != mtime:
+            with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+                _template = CompiledTemplate(f.read(), mtime)
+        return _template
+
+def standee_fields(row_data: Dict, qr_image_src: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    Extract the template values from an AI Spot record (dict or pandas row)
+
+    The QR image is inlined as a locally generated data URI unless
+    qr_image_src overrides it (e.g. a cid: reference in emails).
+
+    Returns:
+        Tuple of values in STANDEE_FIELDS order
+    """
+    def value(key):
+        raw = row_data.get(key, '')
+        return '' if raw is None or raw != raw else str(raw)  # raw != raw: NaN from pandas
+
+    qr_code_link = value('qr_code_link')
+
+    return (
+        value('name'),
+        value('type_of_place'),
+        value('owner_manager_name'),
+        value('aispot_id')[:8],
+        qr_code_link,
+        qr_image_src if qr_image_src is not None else qr_code_src(qr_code_link),
+    )
+
+@lru_cache(maxsize=256)
+def _render_cached(template: CompiledTemplate, fields: Tuple[str, ...], hide_download: bool) -> str:
+    html_content = template.render(dict(zip(STANDEE_FIELDS, fields)))
+    if hide_download:
+        html_content = html_content.replace(_DOWNLOAD_SECTION, _HIDDEN_DOWNLOAD_SECTION)
+    return html_content
+
+def render_standee_html(row_data: Dict, hide_download: bool = False, qr_image_src: Optional[str] = None) -> str:
+    """
+    Render the standee HTML for an AI Spot
+
+    Output is memoized per template version and record fields, so repeat
+    renders of an unchanged record are a dictionary lookup.
+
+    Args:
+        row_data: Dictionary (or pandas row) containing AI Spot data
+        hide_download: Hide the "Download PDF" button section (for PDF output)
+        qr_image_src: Override for the QR <img> src (None for an inline data URI)
+
+    Returns:
+        str: Rendered HTML
+    """
+    return _render_cached(get_standee_template(), standee_fields(row_data, qr_image_src), hide_download)
@@ -0,0 +1,42 @@
+"""
+UI feedback utility module
+Routes status messages to Streamlit on the script thread and to logging elsewhere
+"""
+
+import sys
+import logging
+
+logger = logging.getLogger("aispot")
+
+def _on_script_thread() -> bool:
+    """True when called from a thread that can write to the Streamlit page"""
+    # Headless runs never import Streamlit, so don't pull it in here
+    if 'streamlit' not in sys.modules:
+        return False
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    return get_script_run_ctx(suppress_warning=True) is not None
+
+def _st():
+    import streamlit as st
+    return st
+
+def show_error(message: str):
+    """Show an error message"""
+    if _on_script_thread():
+        _st().error(message)
+    else:
+        logger.error(message)
+
+def show_warning(message: str):
+    """Show a warning message"""
+    if _on_script_thread():
+        _st().warning(message)
+    else:
+        logger.warning(message)
+
+def show_success(message: str):
+    """Show a success message"""
+    if _on_script_thread():
+        _st().success(message)
+    else:
+        logger.info(message)